@@ -1,13 +1,24 @@
+from collections import OrderedDict
+from collections.abc import Mapping
 from dataclasses import dataclass
+import functools
 import json
 import logging
 import os
+import string
 import sys
-from urllib.parse import urlparse
 
 from dotenv import find_dotenv, load_dotenv
 import yaml
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # orjson is an optional speedup; stdlib json is equivalent
+    from json import loads as _json_loads  # type: ignore[assignment]
+
+# libyaml's C loader when PyYAML was built with it; same safe subset either way
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 def setup_logging():
     """Set up basic logging configuration."""
@@ -32,9 +43,14 @@ setup_logging()
 logger = get_logger()
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PinotConfig:
-    """Configuration container for Pinot connection settings"""
+    """Configuration container for Pinot connection settings
+
+    Frozen because load_pinot_config() hands the same cached instance to
+    every caller; use dataclasses.replace() to derive a modified copy.
+    PinotClient keeps its own copy of included_tables for hot-reload.
+    """
 
     controller_url: str
     broker_host: str
@@ -52,9 +68,13 @@ class PinotConfig:
     table_filter_file: str | None = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ServerConfig:
-    """Configuration container for MCP server transport settings"""
+    """Configuration container for MCP server transport settings
+
+    Frozen because load_server_config() hands the same cached instance to
+    every caller.
+    """
 
     transport: str = "http"
     host: str = "127.0.0.1"
@@ -67,6 +87,11 @@ class ServerConfig:
     auth_provider: str | None = None
 
 
+# Values accepted as "enabled" for boolean flags such as OAUTH_ENABLED and
+# PINOT_USE_MSQE (compared case-insensitively).
+_TRUTHY = frozenset({"1", "true", "yes", "on"})
+
+
 # Default OAuth scopes advertised in the server's discovery metadata
 # (scopes_supported) and requested by clients. Without a non-empty
 # scopes_supported, the mcp-remote bridge (Claude Desktop) treats every scope as
@@ -91,37 +116,156 @@ class OAuthConfig:
     required_scopes: list[str] | None = None  # enforced on access tokens (opt-in)
 
 
-def _parse_broker_url(broker_url: str) -> tuple[str, int, str]:
-    """Parse broker URL and return (host, port, scheme)"""
+# Set once the .env lookup has run; the file is only read once per process.
+_dotenv_loaded = False
+
+
+def _load_dotenv() -> None:
+    """Load the nearest .env file once, unless MCP_SKIP_DOTENV is enabled.
+
+    Enabling MCP_SKIP_DOTENV (true/1/yes/on, like the other boolean flags)
+    skips the .env lookup entirely, which keeps tests hermetic and avoids the
+    filesystem walk when configuration is injected by the process manager.
+    """
+    global _dotenv_loaded
+    if _dotenv_loaded or os.getenv("MCP_SKIP_DOTENV", "").lower() in _TRUTHY:
+        return
+    _dotenv_loaded = True
+
+    dotenv_path = find_dotenv(usecwd=True)
+    if dotenv_path:
+        load_dotenv(dotenv_path=dotenv_path, override=True)
+
+
+@functools.lru_cache(maxsize=64)
+def _parse_int(raw: str) -> int:
+    """Convert an integer setting, memoized on the raw string.
+
+    Keyed on the value rather than the variable name, so a changed
+    environment is never served a stale result. Invalid values still raise
+    ``ValueError`` on every call because exceptions are not cached.
+    Ports and timeouts are never negative, so anything but ASCII digits
+    (surrounding whitespace aside) is rejected before reaching ``int()``.
+    """
+    value = raw.strip()
+    if not (value.isascii() and value.isdigit()):
+        raise ValueError(f"expected a non-negative integer, got {raw!r}")
+    return int(value)
+
+
+def _env_int(key: str, default: int, env: Mapping[str, str] = os.environ) -> int:
+    """Return integer variable ``key`` from ``env``, or ``default`` if unset/empty"""
+    raw = env.get(key)
+    if not raw:
+        return default
     try:
-        parsed = urlparse(broker_url)
+        return _parse_int(raw)
+    except ValueError as e:
+        raise ValueError(f"{key}: {e}") from None
+
+
+# (PinotConfig field, environment variable, default) for the settings that are
+# parsed as integers; see load_pinot_config()
+_PINOT_INT_SETTINGS = (
+    ("request_timeout", "PINOT_REQUEST_TIMEOUT", 60),
+    ("connection_timeout", "PINOT_CONNECTION_TIMEOUT", 60),
+    ("query_timeout", "PINOT_QUERY_TIMEOUT", 60),
+)
+
+
+# Normalized MCP_TRANSPORT values keyed by their common spellings, so the usual
+# lower- or upper-case settings skip allocating a lowercased copy
+_TRANSPORTS = {
+    spelling: transport
+    for transport in ("stdio", "http", "streamable-http")
+    for spelling in (transport, transport.upper())
+}
+
+
+# Port used for a broker URL that does not specify one, keyed by scheme
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# (host, port, scheme) returned for a PINOT_BROKER_URL that cannot be parsed
+_DEFAULT_BROKER = ("localhost", 80, "http")
 
-        # Check if we got valid components
-        if not parsed.scheme and not parsed.netloc:
-            raise ValueError(f"Invalid URL format: {broker_url}")
+# Like urllib.parse.urlsplit(): drop tabs and line breaks anywhere in the URL,
+# then surrounding C0 control characters and spaces (e.g. the trailing newline
+# of a URL read from a mounted secret)
+_URL_REMOVED_CHARS = str.maketrans("", "", "\t\r\n")
+_URL_STRIPPED_CHARS = "".join(map(chr, range(0x21)))
+# RFC 3986: scheme = ALPHA *( ALPHA / DIGIT / "+" / "-" / "." )
+_URL_SCHEME_CHARS = string.ascii_letters + string.digits + "+-."
 
-        host = parsed.hostname or "localhost"
-        port = parsed.port or (443 if parsed.scheme == "https" else 80)
-        scheme = parsed.scheme or "http"
+
+@functools.lru_cache(maxsize=128)
+def _parse_broker_url(broker_url: str) -> tuple[str, int, str]:
+    """Parse broker URL and return (host, port, scheme)
+
+    Only the ``scheme://host[:port][/path][?query][#fragment]`` shape is
+    supported, so the URL is scanned with ``str.find``/``str.rfind`` and only
+    the scheme, host and port are sliced out; no regex or ``urllib.parse``.
+    Results are memoized per URL, so a malformed URL is only warned about once.
+    """
+    url = broker_url.translate(_URL_REMOVED_CHARS).strip(_URL_STRIPPED_CHARS)
+    scheme_end = url.find("://")
+    scheme = url[:scheme_end] if scheme_end != -1 else ""
+    if not (
+        scheme[:1].isascii()
+        and scheme[:1].isalpha()
+        and not scheme.strip(_URL_SCHEME_CHARS)
+    ):
+        # Not a URL at all: skip the scan and the exception round-trip
+        logger.warning(
+            f"Failed to parse PINOT_BROKER_URL '{broker_url}': missing or "
+            "invalid scheme. Using defaults."
+        )
+        return _DEFAULT_BROKER
+
+    try:
+        # Per RFC 3986 the authority ends at the first "/", "?" or "#"
+        start = scheme_end + 3
+        end = len(url)
+        for delimiter in "/?#":
+            index = url.find(delimiter, start, end)
+            if index != -1:
+                end = index
+
+        # Skip any userinfo, then split off an explicit port. A colon followed
+        # by "]" belongs to a bracketed IPv6 host rather than a port.
+        start = url.rfind("@", start, end) + 1 or start
+        colon = url.rfind(":", start, end)
+        if colon == -1 or url.find("]", colon, end) != -1:
+            colon = end
+
+        scheme = scheme.lower()
+        host = url[start:colon]
+        # Only a bracketed IPv6 host may contain ":", and brackets must pair up
+        inner = host[1:-1] if host[:1] == "[" and host[-1:] == "]" else host
+        if any(c in inner for c in "[]") or (inner is host and ":" in host):
+            raise ValueError(f"Invalid host: {host!r}")
+        host = inner.lower() or "localhost"
+        port_str = url[colon + 1 : end]
+        # int() would also accept signs, whitespace and non-ASCII digits
+        if port_str and not (port_str.isascii() and port_str.isdigit()):
+            raise ValueError(f"Invalid port: {port_str!r}")
+        port = int(port_str) if port_str else 0
+        if not 0 <= port <= 65535:
+            raise ValueError(f"Port out of range 0-65535: {port}")
+        # As with urlparse(), port 0 means "use the scheme's default"
+        port = port or _DEFAULT_PORTS.get(scheme, 80)
         return host, port, scheme
     except Exception as e:
         logger.warning(
             f"Failed to parse PINOT_BROKER_URL '{broker_url}': {e}. Using defaults."
         )
-        return "localhost", 80, "http"
+        return _DEFAULT_BROKER
 
 
 def _read_token_from_file(token_filename: str) -> str | None:
     """Read token from file and return it, handling errors gracefully"""
     try:
-        if not os.path.exists(token_filename):
-            logger.error(f"Token file not found: {token_filename}")
-            return None
-
-        if not os.path.isfile(token_filename):
-            logger.error(f"Token path is not a file: {token_filename}")
-            return None
-
+        # Open directly rather than checking exists()/isfile() first: one
+        # syscall instead of three, and no window for the file to change
         with open(token_filename, encoding="utf-8") as f:
             token = f.read().strip()
 
@@ -136,6 +280,12 @@ def _read_token_from_file(token_filename: str) -> str | None:
         logger.debug(f"Successfully read token from file: {token_filename}")
         return token
 
+    except FileNotFoundError:
+        logger.error(f"Token file not found: {token_filename}")
+        return None
+    except IsADirectoryError:
+        logger.error(f"Token path is not a file: {token_filename}")
+        return None
     except PermissionError:
         logger.error(f"Permission denied reading token file: {token_filename}")
         return None
@@ -180,7 +330,7 @@ def _parse_table_filter_config(filter_file_path: str) -> dict | None:
     """
     try:
         with open(filter_file_path, encoding="utf-8") as file:
-            config = yaml.safe_load(file)
+            config = yaml.load(file, Loader=_YAML_LOADER)  # noqa: S506
 
         if not config:
             logger.warning("Empty table filter configuration file")
@@ -196,9 +346,17 @@ def _parse_table_filter_config(filter_file_path: str) -> dict | None:
         return None
 
 
+# Parsed table filters keyed by path, stored with the (mtime_ns, size) they were
+# read at so an edited file is parsed again; oldest entries are evicted first
+_FILTER_CACHE: OrderedDict[str, tuple[int, int, list[str] | None]] = OrderedDict()
+_FILTER_CACHE_SIZE = 100
+
+
 def _load_table_filters(filter_file_path: str | None) -> list[str] | None:
     """Load table filters from YAML configuration file.
 
+    Parsed results are cached per path until the file's mtime or size changes.
+
     Args:
         filter_file_path: Path to YAML file containing table filters
 
@@ -209,6 +367,27 @@ def _load_table_filters(filter_file_path: str | None) -> list[str] | None:
     if not filter_file_path or not _validate_filter_file_path(filter_file_path):
         return None
 
+    try:
+        stat = os.stat(filter_file_path)
+    except OSError:
+        return _read_table_filters(filter_file_path)
+    version = (stat.st_mtime_ns, stat.st_size)
+
+    cached = _FILTER_CACHE.get(filter_file_path)
+    if cached is None or cached[:2] != version:
+        cached = (*version, _read_table_filters(filter_file_path))
+        _FILTER_CACHE[filter_file_path] = cached
+        if len(_FILTER_CACHE) > _FILTER_CACHE_SIZE:
+            _FILTER_CACHE.popitem(last=False)
+    _FILTER_CACHE.move_to_end(filter_file_path)
+
+    # Hand out a copy so callers cannot mutate the cached list
+    tables = cached[2]
+    return list(tables) if tables is not None else None
+
+
+def _read_table_filters(filter_file_path: str) -> list[str] | None:
+    """Parse the included table list out of a filter file, uncached"""
     config = _parse_table_filter_config(filter_file_path)
     if not config:
         return None
@@ -246,12 +425,23 @@ def reload_table_filters_from_file(file_path: str) -> list[str] | None:
     return _load_table_filters(file_path)
 
 
+@functools.lru_cache(maxsize=1)
 def load_pinot_config() -> PinotConfig:
-    """Load and return Pinot configuration from environment variables"""
-    load_dotenv(dotenv_path=find_dotenv(usecwd=True), override=True)
+    """Load and return Pinot configuration from environment variables
 
+    The result is cached for the life of the process; call
+    ``load_pinot_config.cache_clear()`` to pick up environment changes.
+    """
+    _load_dotenv()
+    # Copy the environment up front so every setting below comes from one
+    # consistent view, even if it is modified while the config is built
+    return _pinot_config_from_env(dict(os.environ))
+
+
+def _pinot_config_from_env(env: Mapping[str, str]) -> PinotConfig:
+    """Build a PinotConfig from the variables in ``env`` (uncached)."""
     # Get the broker URL if provided
-    broker_url = os.getenv("PINOT_BROKER_URL")
+    broker_url = env.get("PINOT_BROKER_URL")
 
     # Parse defaults from URL if provided
     if broker_url:
@@ -260,39 +450,38 @@ def load_pinot_config() -> PinotConfig:
         # Default to Pinot quickstart values
         url_host, url_port, url_scheme = "localhost", 8000, "http"
 
-    # Get individual broker configs with URL as fallback
-    broker_host = os.getenv("PINOT_BROKER_HOST", url_host)
-    broker_port = int(os.getenv("PINOT_BROKER_PORT", str(url_port)))
-    broker_scheme = os.getenv("PINOT_BROKER_SCHEME", url_scheme)
+    # Get individual broker configs with URL as fallback. The raw values are
+    # kept for the override warnings below.
+    host_env = env.get("PINOT_BROKER_HOST")
+    port_env = env.get("PINOT_BROKER_PORT")
+    scheme_env = env.get("PINOT_BROKER_SCHEME")
+    broker_host = url_host if host_env is None else host_env
+    broker_port = _env_int("PINOT_BROKER_PORT", url_port, env)
+    # Interned so downstream equality checks against "http"/"https" can
+    # short-circuit on identity
+    broker_scheme = sys.intern(url_scheme if scheme_env is None else scheme_env)
 
     # Issue warnings if individual configs override URL values
     if broker_url:
-        if (
-            os.getenv("PINOT_BROKER_HOST")
-            and os.getenv("PINOT_BROKER_HOST") != url_host
-        ):
+        if host_env and host_env != url_host:
             logger.warning(
                 f"PINOT_BROKER_HOST='{broker_host}' overrides host "
                 f"'{url_host}' from PINOT_BROKER_URL"
             )
-        broker_port_env = os.getenv("PINOT_BROKER_PORT")
-        if broker_port_env and int(broker_port_env) != url_port:
+        if port_env and broker_port != url_port:
             logger.warning(
                 f"PINOT_BROKER_PORT='{broker_port}' overrides port "
                 f"'{url_port}' from PINOT_BROKER_URL"
             )
-        if (
-            os.getenv("PINOT_BROKER_SCHEME")
-            and os.getenv("PINOT_BROKER_SCHEME") != url_scheme
-        ):
+        if scheme_env and scheme_env != url_scheme:
             logger.warning(
                 f"PINOT_BROKER_SCHEME='{broker_scheme}' overrides scheme "
                 f"'{url_scheme}' from PINOT_BROKER_URL"
             )
 
     # Load token, prioritizing direct token over token file
-    token = os.getenv("PINOT_TOKEN")
-    token_filename = os.getenv("PINOT_TOKEN_FILENAME")
+    token = env.get("PINOT_TOKEN")
+    token_filename = env.get("PINOT_TOKEN_FILENAME")
 
     # If no direct token but token filename is provided, read from file
     if not token and token_filename:
@@ -303,54 +492,85 @@ def load_pinot_config() -> PinotConfig:
             )
 
     # Load table filters from YAML file if configured
-    filter_file_path = os.getenv("PINOT_TABLE_FILTER_FILE")
+    filter_file_path = env.get("PINOT_TABLE_FILTER_FILE")
     included_tables = _load_table_filters(filter_file_path)
 
+    timeouts: dict[str, int] = {
+        field: _env_int(key, default, env)
+        for field, key, default in _PINOT_INT_SETTINGS
+    }
+
     return PinotConfig(
-        controller_url=os.getenv("PINOT_CONTROLLER_URL", "http://localhost:9000"),
+        controller_url=env.get("PINOT_CONTROLLER_URL", "http://localhost:9000"),
         broker_host=broker_host,
         broker_port=broker_port,
         broker_scheme=broker_scheme,
-        username=os.getenv("PINOT_USERNAME"),
-        password=os.getenv("PINOT_PASSWORD"),
+        username=env.get("PINOT_USERNAME"),
+        password=env.get("PINOT_PASSWORD"),
         token=token,
-        database=os.getenv("PINOT_DATABASE", ""),
-        use_msqe=os.getenv("PINOT_USE_MSQE", "false").lower() == "true",
-        request_timeout=int(os.getenv("PINOT_REQUEST_TIMEOUT", "60")),
-        connection_timeout=int(os.getenv("PINOT_CONNECTION_TIMEOUT", "60")),
-        query_timeout=int(os.getenv("PINOT_QUERY_TIMEOUT", "60")),
+        database=env.get("PINOT_DATABASE", ""),
+        use_msqe=env.get("PINOT_USE_MSQE", "false").lower() in _TRUTHY,
         included_tables=included_tables,
         table_filter_file=filter_file_path,
+        **timeouts,
     )
 
 
-def _resolve_auth_provider() -> str | None:
-    """Resolve the active auth provider name from the environment.
+def _resolve_auth_provider(env: Mapping[str, str] = os.environ) -> str | None:
+    """Resolve the active auth provider name from the environment ``env``.
 
     Honors ``AUTH_PROVIDER`` when set; otherwise falls back to the legacy
-    ``OAUTH_ENABLED`` flag ('true' -> 'oauth') for backward compatibility.
+    ``OAUTH_ENABLED`` flag (truthy -> 'oauth') for backward compatibility.
     """
-    explicit = os.getenv("AUTH_PROVIDER")
+    explicit = env.get("AUTH_PROVIDER")
     if explicit and explicit.strip():
         return explicit.strip().lower()
-    if os.getenv("OAUTH_ENABLED", "false").lower() == "true":
+    if env.get("OAUTH_ENABLED", "false").lower() in _TRUTHY:
         return "oauth"
     return None
 
 
+# Every variable load_server_config() reads; their values form its cache key
+_SERVER_ENV_KEYS = (
+    "MCP_TRANSPORT",
+    "MCP_HOST",
+    "MCP_PORT",
+    "MCP_SSL_KEYFILE",
+    "MCP_SSL_CERTFILE",
+    "MCP_PATH",
+    "OAUTH_ENABLED",
+    "AUTH_PROVIDER",
+)
+
+
 def load_server_config() -> ServerConfig:
-    """Load and return MCP server configuration from environment variables"""
-    load_dotenv(dotenv_path=find_dotenv(usecwd=True), override=True)
+    """Load and return MCP server configuration from environment variables
+
+    Results are cached per distinct set of values of the variables read, so
+    repeated calls are cheap and an environment change is picked up without
+    clearing anything.
+    """
+    _load_dotenv()
+    return _server_config_for(tuple(os.environ.get(k) for k in _SERVER_ENV_KEYS))
+
+
+@functools.lru_cache(maxsize=8)
+def _server_config_for(values: tuple[str | None, ...]) -> ServerConfig:
+    """Build the ServerConfig for one snapshot of the _SERVER_ENV_KEYS values."""
+    env = {k: v for k, v in zip(_SERVER_ENV_KEYS, values, strict=True) if v is not None}
+
+    raw_transport = env.get("MCP_TRANSPORT", "http")
+    transport = _TRANSPORTS.get(raw_transport) or sys.intern(raw_transport.lower())
 
     return ServerConfig(
-        transport=os.getenv("MCP_TRANSPORT", "http").lower(),
-        host=os.getenv("MCP_HOST", "127.0.0.1"),
-        port=int(os.getenv("MCP_PORT", "8080")),
-        ssl_keyfile=os.getenv("MCP_SSL_KEYFILE"),
-        ssl_certfile=os.getenv("MCP_SSL_CERTFILE"),
-        oauth_enabled=os.getenv("OAUTH_ENABLED", "false").lower() == "true",
-        path=os.getenv("MCP_PATH", "/mcp"),
-        auth_provider=_resolve_auth_provider(),
+        transport=transport,
+        host=env.get("MCP_HOST", "127.0.0.1"),
+        port=_env_int("MCP_PORT", 8080, env),
+        ssl_keyfile=env.get("MCP_SSL_KEYFILE"),
+        ssl_certfile=env.get("MCP_SSL_CERTFILE"),
+        oauth_enabled=env.get("OAUTH_ENABLED", "false").lower() in _TRUTHY,
+        path=env.get("MCP_PATH", "/mcp"),
+        auth_provider=_resolve_auth_provider(env),
     )
 
 
@@ -387,7 +607,7 @@ def load_static_token() -> str:
     misconfigured ``AUTH_PROVIDER=static`` deployment fails at startup rather
     than accepting requests it cannot authenticate.
     """
-    load_dotenv(dotenv_path=find_dotenv(usecwd=True), override=True)
+    _load_dotenv()
     token = os.getenv("MCP_STATIC_TOKEN", "").strip()
     if not token:
         raise ValueError(
@@ -399,34 +619,34 @@ def load_static_token() -> str:
 
 def load_oauth_config() -> OAuthConfig:
     """Load and return OAuth configuration from environment variables"""
-    load_dotenv(dotenv_path=find_dotenv(usecwd=True), override=True)
+    _load_dotenv()
+    # One copy for the whole load, so the OAuth settings cannot be read from
+    # a half-updated environment
+    env = dict(os.environ)
 
     # Parse extra authorization parameters from environment variables
     # Format: OAUTH_EXTRA_AUTH_PARAMS='{"param1": "value1", "param2": "value2"}'
     extra_authorize_params = None
-    extra_params_str = os.getenv("OAUTH_EXTRA_AUTH_PARAMS")
-    if extra_params_str:
+    extra_params_str = env.get("OAUTH_EXTRA_AUTH_PARAMS", "").strip()
+    if extra_params_str and not extra_params_str.startswith("{"):
+        # Anything but an object is rejected anyway; skip the decoder
+        logger.warning("OAUTH_EXTRA_AUTH_PARAMS must be a JSON object. Ignoring.")
+    elif extra_params_str:
         try:
-            extra_authorize_params = json.loads(extra_params_str)
-            if not isinstance(extra_authorize_params, dict):
-                logger.warning(
-                    "OAUTH_EXTRA_AUTH_PARAMS must be a JSON object. Ignoring."
-                )
-                extra_authorize_params = None
+            extra_authorize_params = _json_loads(extra_params_str)
         except (json.JSONDecodeError, ValueError) as e:
             logger.warning(f"Invalid OAUTH_EXTRA_AUTH_PARAMS JSON: {e}. Ignoring.")
-            extra_authorize_params = None
 
     return OAuthConfig(
-        client_id=os.getenv("OAUTH_CLIENT_ID", ""),
-        client_secret=os.getenv("OAUTH_CLIENT_SECRET", ""),
-        base_url=os.getenv("OAUTH_BASE_URL", "http://localhost:8080"),
-        upstream_authorization_endpoint=os.getenv("OAUTH_AUTHORIZATION_ENDPOINT", ""),
-        upstream_token_endpoint=os.getenv("OAUTH_TOKEN_ENDPOINT", ""),
-        jwks_uri=os.getenv("OAUTH_JWKS_URI", ""),
-        issuer=os.getenv("OAUTH_ISSUER", ""),
-        audience=os.getenv("OAUTH_AUDIENCE"),
+        client_id=env.get("OAUTH_CLIENT_ID", ""),
+        client_secret=env.get("OAUTH_CLIENT_SECRET", ""),
+        base_url=env.get("OAUTH_BASE_URL", "http://localhost:8080"),
+        upstream_authorization_endpoint=env.get("OAUTH_AUTHORIZATION_ENDPOINT", ""),
+        upstream_token_endpoint=env.get("OAUTH_TOKEN_ENDPOINT", ""),
+        jwks_uri=env.get("OAUTH_JWKS_URI", ""),
+        issuer=env.get("OAUTH_ISSUER", ""),
+        audience=env.get("OAUTH_AUDIENCE"),
         extra_authorize_params=extra_authorize_params,
-        scopes=_parse_oauth_scopes(os.getenv("OAUTH_SCOPES")),
-        required_scopes=_parse_optional_scopes(os.getenv("OAUTH_REQUIRED_SCOPES")),
+        scopes=_parse_oauth_scopes(env.get("OAUTH_SCOPES")),
+        required_scopes=_parse_optional_scopes(env.get("OAUTH_REQUIRED_SCOPES")),
     )
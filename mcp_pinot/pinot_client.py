@@ -1,11 +1,12 @@
 import base64
-from fnmatch import fnmatch
+from fnmatch import translate
+import functools
 import json
+import os
 import re
 from threading import Lock
 from typing import Any
 
-import pandas as pd
 from pinotdb import connect
 import requests
 import sqlglot
@@ -81,55 +82,51 @@ _PROHIBITED_READ_QUERY_KEYWORDS = {
 }
 
 
-def _strip_sql_comments(query: str) -> str:
-    """Remove SQL comments while preserving quoted strings and identifiers."""
-    result: list[str] = []
-    quote: str | None = None
-    i = 0
+# Where _strip_sql_comments() has to look closer: a comment or quote opener
+_SQL_COMMENT_OR_QUOTE = re.compile(r"--|/\*|['\"`]")
+# A quoted string or identifier from its opening quote up to and including
+# the closing one (or the end of the query). Doubled quotes stay inside, and
+# so does a backslash-escaped character in strings, but not in identifiers.
+_SQL_QUOTED = {
+    "'": re.compile(r"'(?:[^'\\]++|\\.|'')*+'?", re.DOTALL),
+    '"': re.compile(r'"(?:[^"\\]++|\\.|"")*+"?', re.DOTALL),
+    "`": re.compile(r"`(?:[^`]++|``)*+`?"),
+}
 
-    while i < len(query):
-        char = query[i]
-        next_char = query[i + 1] if i + 1 < len(query) else ""
 
-        if quote:
-            result.append(char)
-            if char == "\\" and quote in {"'", '"'} and next_char:
-                result.append(next_char)
-                i += 2
-                continue
-            if char == quote:
-                if next_char == quote:
-                    result.append(next_char)
-                    i += 2
-                    continue
-                quote = None
-            i += 1
-            continue
-
-        if char in {"'", '"', "`"}:
-            quote = char
-            result.append(char)
-            i += 1
-            continue
+def _strip_sql_comments(query: str) -> str:
+    """Remove SQL comments while preserving quoted strings and identifiers.
 
-        if char == "-" and next_char == "-":
-            i += 2
-            while i < len(query) and query[i] not in {"\n", "\r"}:
-                i += 1
+    Text between comments and quotes is copied as whole slices; only the
+    positions where one starts are located, with a single compiled search.
+    """
+    result: list[str] = []
+    pos = 0
+    end = len(query)
+
+    while match := _SQL_COMMENT_OR_QUOTE.search(query, pos):
+        start = match.start()
+        opener = match.group()
+        result.append(query[pos:start])
+
+        if opener == "--":
+            # Drop up to, not including, the line break
+            newline = query.find("\n", start + 2)
+            carriage = query.find("\r", start + 2)
+            if newline < 0 or 0 <= carriage < newline:
+                newline = carriage
+            pos = end if newline < 0 else newline
             result.append("\n")
-            continue
-
-        if char == "/" and next_char == "*":
-            i += 2
-            while i + 1 < len(query) and not (query[i] == "*" and query[i + 1] == "/"):
-                i += 1
-            i = min(i + 2, len(query))
+        elif opener == "/*":
+            close = query.find("*/", start + 2)
+            pos = end if close < 0 else close + 2
             result.append(" ")
-            continue
-
-        result.append(char)
-        i += 1
+        else:
+            quoted = _SQL_QUOTED[opener].match(query, start)
+            pos = quoted.end() if quoted else start + 1
+            result.append(query[start:pos])
 
+    result.append(query[pos:])
     return "".join(result)
 
 
@@ -332,6 +329,168 @@ def _strip_trailing_pinot_option(statement: str) -> str:
     return statement
 
 
+# Tokenizers for table-name extraction: comments, quoted strings and quoted
+# identifiers come back as single tokens, so nothing inside them is read as
+# SQL. Pinot's parser does not treat backslash as an escape, but
+# _strip_sql_comments() does. Each tokenizer lexes comments itself under its
+# own convention, and the names from both are kept.
+_SQL_TOKEN_PATTERNS = (
+    re.compile(
+        r"""--[^\r\n]*+
+          | /\*.*?(?:\*/|\Z)
+          | '(?:[^'\\]++|\\.|'')*+'?
+          | "(?:[^"\\]++|\\.|"")*+"?
+          | `(?:[^`]++|``)*+`?
+          | \w+
+          | [^\w\s]""",
+        re.VERBOSE | re.DOTALL,
+    ),
+    re.compile(
+        r"""--[^\r\n]*+
+          | /\*.*?(?:\*/|\Z)
+          | '(?:[^']++|'')*+'?
+          | "(?:[^"]++|"")*+"?
+          | `(?:[^`]++|``)*+`?
+          | \w+
+          | [^\w\s]""",
+        re.VERBOSE | re.DOTALL,
+    ),
+)
+# The (last part of the) name right after FROM or JOIN, found by a plain
+# regex search that does not track quotes. Run over the comment-stripped
+# query as a backstop, it keeps every table in those positions that the
+# tokenizers could miss by pairing up quotes differently from Pinot.
+_FROM_JOIN_NAME = re.compile(
+    r"""\b(?:FROM|JOIN)\s+(?=(?:(?:"[^"]*+"|`[^`]*+`|\w++)\s*+\.\s*+)*+
+        (?:"([^"]+)"|`([^`]+)`|(\w+)))""",
+    re.IGNORECASE | re.VERBOSE,
+)
+# Bare words never taken as a table name where one is expected
+_NOT_TABLE_NAMES = frozenset(
+    {"LEFT", "RIGHT", "INNER", "OUTER", "FULL", "CROSS", "ON", "WHERE", "GROUP"}
+    | {"ORDER", "HAVING", "LIMIT", "SELECT", "WITH", "VALUES"}
+)
+# Keywords that end a FROM clause at its own nesting level; until then, a
+# comma at that level introduces another table
+_FROM_CLAUSE_END = frozenset(
+    {"WHERE", "GROUP", "ORDER", "HAVING", "LIMIT", "OFFSET", "FETCH", "OPTION"}
+    | {"UNION", "INTERSECT", "EXCEPT", "MINUS", "WINDOW", "QUALIFY", "SELECT"}
+)
+
+
+def _scan_table_names(query: str, token_re: re.Pattern[str]) -> set[str]:
+    """Collect the table names in FROM/JOIN clauses from one tokenization.
+
+    A name follows FROM or JOIN, or a comma directly inside a FROM clause, so
+    select lists, IN lists and GROUP BY columns are not mistaken for tables.
+    For qualified names (``db.schema.table``) only the last part is the table
+    checked against the filter, whether or not any part is quoted.
+    Subqueries and parenthesized joins are tracked by nesting level.
+    """
+    names: set[str] = set()
+    from_depths: list[int] = []  # nesting levels with an open FROM clause
+    depth = 0
+    expect_name = False
+    name: str | None = None  # last part of the table name being read
+    after_dot = False
+
+    for part in token_re.findall(query):
+        first = part[0]
+        if part.startswith(("--", "/*")):
+            continue
+        quoted = first in '"`'
+        ident: str | None
+        if quoted:
+            closed = len(part) > 1 and part[-1] == first
+            inner = part[1 : -1 if closed else None]
+            ident = inner.replace(first * 2, first)
+        elif first.isalnum() or first == "_":
+            ident = part
+        else:
+            ident = None
+
+        # The table name itself, or the next part of a qualified one
+        if ident is not None and (
+            after_dot
+            or (expect_name and (quoted or part.upper() not in _NOT_TABLE_NAMES))
+        ):
+            name, expect_name, after_dot = ident, False, False
+            continue
+        if name is not None:
+            if part == "." and not after_dot:
+                after_dot = True
+                continue
+            names.add(name)
+            name, after_dot = None, False
+        expecting, expect_name = expect_name, False
+        in_from = bool(from_depths) and from_depths[-1] == depth
+
+        if ident is not None and not quoted:
+            keyword = part.upper()
+            if keyword in {"FROM", "JOIN"}:
+                expect_name = True
+                if not in_from:
+                    from_depths.append(depth)
+            elif keyword in _FROM_CLAUSE_END and in_from:
+                from_depths.pop()
+        elif part == "(":
+            depth += 1
+            if expecting:
+                # FROM (a, b) or JOIN (b JOIN c ...): still inside the clause
+                from_depths.append(depth)
+                expect_name = True
+        elif part == ")" and depth:
+            if in_from:
+                from_depths.pop()
+            depth -= 1
+        elif part == ",":
+            expect_name = in_from
+        elif part == ";":
+            from_depths.clear()
+            depth = 0
+
+    if name is not None:
+        names.add(name)
+    return names
+
+
+@functools.lru_cache(maxsize=1024)
+def _sql_table_names(query: str) -> tuple[str, ...]:
+    """Return the unique table names referenced by ``query``.
+
+    Memoized on the raw query string: clients tend to resend the same query
+    text, and the table filter is checked on every ``execute_query`` call.
+    """
+    names: set[str] = set()
+    for token_re in _SQL_TOKEN_PATTERNS:
+        names |= _scan_table_names(query, token_re)
+    for double, backtick, bare in _FROM_JOIN_NAME.findall(_strip_sql_comments(query)):
+        if double or backtick:
+            names.add(double or backtick)
+        elif bare.upper() not in _NOT_TABLE_NAMES:
+            names.add(bare)
+    return tuple(names)
+
+
+# fnmatch.fnmatch() compares os.path.normcase()d names, which is
+# case-insensitive on Windows; keep table filters behaving the same.
+_TABLE_PATTERN_FLAGS = 0 if os.path.normcase("A") == "A" else re.IGNORECASE
+
+
+def _compile_table_patterns(patterns: list[str] | None) -> re.Pattern[str] | None:
+    """Compile ``included_tables`` globs into one regex, or None when unfiltered.
+
+    A single alternation is matched once per table name instead of calling
+    ``fnmatch`` for every pattern.
+    """
+    if not patterns:
+        return None
+    return re.compile(
+        "|".join(f"(?:{translate(pattern)})" for pattern in patterns),
+        _TABLE_PATTERN_FLAGS,
+    )
+
+
 def create_connection(config: PinotConfig) -> connect:
     """Create Pinot connection with proper authentication handling"""
     try:
@@ -380,7 +539,25 @@ class PinotClient:
         self._conn = None
         # Store filters separately to avoid mutating config
         self._included_tables = config.included_tables
+        self._included_re = _compile_table_patterns(self._included_tables)
         self._config_lock = Lock()  # For thread-safe filter updates
+        self._http: requests.Session | None = None
+        self._auth_headers: dict[str, str] | None = None
+
+    @property
+    def _session(self) -> requests.Session:
+        """Pooled HTTP session, created on the first controller/broker call
+
+        One session lets requests reuse keep-alive connections instead of
+        opening a new TCP (and TLS) connection each time; creating it lazily
+        keeps clients that never make an HTTP call cheap to construct.
+        Creation is guarded by the lock so concurrent first calls share one.
+        """
+        if self._http is None:
+            with self._config_lock:
+                if self._http is None:
+                    self._http = requests.Session()
+        return self._http
 
     def reload_table_filters(self) -> dict[str, Any]:
         """Reload table filters from the configured filter file without restarting.
@@ -407,12 +584,14 @@ class PinotClient:
 
         # Load new filters (validates file exists and parses YAML)
         new_filters = reload_table_filters_from_file(self.config.table_filter_file)
+        new_re = _compile_table_patterns(new_filters)
 
         # Atomically update the filters with lock
         with self._config_lock:
             old_filters = self._included_tables
             old_count = len(old_filters) if old_filters else 0
             self._included_tables = new_filters
+            self._included_re = new_re
             new_count = len(new_filters) if new_filters else 0
 
         logger.info(f"Table filters reloaded: {old_count} -> {new_count} tables")
@@ -427,6 +606,17 @@ class PinotClient:
         }
 
     def _create_auth_headers(self) -> dict[str, str]:
+        """Return a fresh copy of the per-client HTTP headers
+
+        The headers only depend on the client's configuration, so they are
+        built (and basic credentials base64-encoded) once; callers get a copy
+        they are free to modify.
+        """
+        if self._auth_headers is None:
+            self._auth_headers = self._build_auth_headers()
+        return dict(self._auth_headers)
+
+    def _build_auth_headers(self) -> dict[str, str]:
         """Create HTTP headers with authentication based on configuration"""
         headers = {"accept": "application/json", "Content-Type": "application/json"}
 
@@ -453,7 +643,7 @@ class PinotClient:
 
         try:
             if method.upper() == "POST":
-                response = requests.post(
+                response = self._session.post(
                     url,
                     headers=headers,
                     json=json_data,
@@ -464,7 +654,7 @@ class PinotClient:
                     verify=True,
                 )
             else:
-                response = requests.get(
+                response = self._session.get(
                     url,
                     headers=headers,
                     timeout=(
@@ -684,9 +874,8 @@ class PinotClient:
 
             # Get column names and fetch results
             columns = [item[0] for item in curs.description] if curs.description else []
-            df = pd.DataFrame(curs.fetchall(), columns=columns)
-
-            result = df.to_dict(orient="records")
+            # Same row dicts as the HTTP path; no DataFrame round-trip needed
+            result = [dict(zip(columns, row, strict=False)) for row in curs.fetchall()]
             logger.debug(f"Query executed successfully, returned {len(result)} rows")
             return result
 
@@ -697,9 +886,10 @@ class PinotClient:
             self._conn = None
             raise
 
-    def _matches_patterns(self, table: str, patterns: list[str]) -> bool:
-        """Check if table matches any pattern."""
-        return any(fnmatch(table, pattern) for pattern in patterns)
+    def _matches_patterns(self, table: str) -> bool:
+        """Check if table matches any included_tables pattern."""
+        included_re = self._included_re
+        return included_re is None or included_re.match(table) is not None
 
     def _is_table_filtering_enabled(self) -> bool:
         """Check if table filtering is configured and enabled.
@@ -722,35 +912,7 @@ class PinotClient:
         Returns:
             list[str]: Unique list of table names found in the query
         """
-        # Remove comments and normalize whitespace
-        query = _strip_sql_comments(query)
-        query = " ".join(query.split())
-
-        matches = []
-
-        # Pattern 1: Unquoted tables (after FROM/JOIN or comma-separated)
-        # Matches: FROM table, JOIN table, table1, table2
-        # Uses negative lookahead to exclude SQL keywords (LEFT, RIGHT, INNER, etc.)
-        unquoted_pattern = (
-            r"(?:\b(?:FROM|JOIN)\s+|,\s*)"
-            r"(?:[\w.]+\.)?"
-            r"(?!(?:LEFT|RIGHT|INNER|OUTER|FULL|CROSS|ON|WHERE|GROUP|ORDER|"
-            r"HAVING|LIMIT)\b)"
-            r"(\w+)"
-        )
-        matches.extend(re.findall(unquoted_pattern, query, re.IGNORECASE))
-
-        # Pattern 2: Double-quoted tables (after FROM/JOIN or comma-separated)
-        # Matches: FROM "table name", "quoted_table", "another table"
-        double_quoted_pattern = r'(?:\b(?:FROM|JOIN)\s+|,\s*)(?:[\w.]+\.)?"([^"]+)"'
-        matches.extend(re.findall(double_quoted_pattern, query, re.IGNORECASE))
-
-        # Pattern 3: Backtick-quoted tables (after FROM/JOIN or comma-separated)
-        # Matches: FROM `table_name`, `quoted table`, `another table`
-        backtick_pattern = r"(?:\b(?:FROM|JOIN)\s+|,\s*)(?:[\w.]+\.)?`([^`]+)`"
-        matches.extend(re.findall(backtick_pattern, query, re.IGNORECASE))
-
-        return list(set(matches))
+        return list(_sql_table_names(query))
 
     def _validate_table_name_access(self, table_name: str) -> None:
         """Validate that a table name is allowed by filtering rules.
@@ -765,7 +927,7 @@ class PinotClient:
         if not included:
             return
 
-        if not self._matches_patterns(table_name, included):
+        if not self._matches_patterns(table_name):
             allowed = ", ".join(included)
             raise ValueError(
                 f"Access denied to table '{table_name}'. Allowed tables: {allowed}"
@@ -809,9 +971,7 @@ class PinotClient:
             return
 
         unauthorized_tables = [
-            table
-            for table in table_names
-            if not self._matches_patterns(table, included)
+            table for table in table_names if not self._matches_patterns(table)
         ]
 
         if unauthorized_tables:
@@ -828,7 +988,7 @@ class PinotClient:
         if not tables or not included:
             return tables
 
-        return [t for t in tables if self._matches_patterns(t, included)]
+        return [t for t in tables if self._matches_patterns(t)]
 
     def get_tables(self, params: dict[str, Any] | None = None) -> list[str]:
         url = f"{self.config.controller_url}/{PinotEndpoints.TABLES}"
@@ -922,7 +1082,7 @@ class PinotClient:
         params = {"override": str(override).lower(), "force": str(force).lower()}
         headers = self._create_auth_headers()
         headers["Content-Type"] = "application/json"
-        response = requests.post(
+        response = self._session.post(
             url,
             headers=headers,
             params=params,
@@ -952,7 +1112,7 @@ class PinotClient:
         params = {"reload": str(reload).lower(), "force": str(force).lower()}
         headers = self._create_auth_headers()
         headers["Content-Type"] = "application/json"
-        response = requests.put(
+        response = self._session.put(
             url,
             headers=headers,
             params=params,
@@ -974,7 +1134,7 @@ class PinotClient:
         self._validate_table_name_access(schemaName)
         url = f"{self.config.controller_url}/{PinotEndpoints.SCHEMAS}/{schemaName}"
         headers = self._create_auth_headers()
-        response = requests.get(
+        response = self._session.get(
             url,
             headers=headers,
             timeout=(self.config.connection_timeout, self.config.request_timeout),
@@ -995,7 +1155,7 @@ class PinotClient:
             params["validationTypesToSkip"] = validationTypesToSkip
         headers = self._create_auth_headers()
         headers["Content-Type"] = "application/json"
-        response = requests.post(
+        response = self._session.post(
             url,
             headers=headers,
             params=params,
@@ -1026,7 +1186,7 @@ class PinotClient:
             params["validationTypesToSkip"] = validationTypesToSkip
         headers = self._create_auth_headers()
         headers["Content-Type"] = "application/json"
-        response = requests.put(
+        response = self._session.put(
             url,
             headers=headers,
             params=params,
@@ -1055,7 +1215,7 @@ class PinotClient:
         if tableType:
             params["type"] = tableType
         headers = self._create_auth_headers()
-        response = requests.get(
+        response = self._session.get(
             url,
             headers=headers,
             params=params,
@@ -1,3 +1,58 @@
 """
 Test configuration file for pytest.
 """
+
+import os
+
+import pytest
+
+# Never read a developer's .env during tests: it would override the
+# environment each test sets up (load_dotenv runs with override=True).
+os.environ["MCP_SKIP_DOTENV"] = "1"
+
+from mcp_pinot.config import (
+    _FILTER_CACHE,
+    _parse_broker_url,
+    _server_config_for,
+    load_pinot_config,
+)
+from mcp_pinot.pinot_client import _sql_table_names
+
+_CACHED = (load_pinot_config, _server_config_for, _parse_broker_url, _sql_table_names)
+
+
+@pytest.fixture(autouse=True)
+def _clear_config_caches():
+    """Make every test load configuration from its own environment."""
+    for cached in _CACHED:
+        cached.cache_clear()
+    _FILTER_CACHE.clear()
+    yield
+    for cached in _CACHED:
+        cached.cache_clear()
+    _FILTER_CACHE.clear()
+
+
+# Prefixes of every variable the mcp_pinot.config loaders read
+_CONFIG_PREFIXES = ("PINOT_", "MCP_", "OAUTH_", "AUTH_")
+
+
+@pytest.fixture
+def clean_env(monkeypatch):
+    """Return a setter that makes the given variables the only config settings.
+
+    Only variables the loaders read are removed, rather than the whole
+    environment, and monkeypatch restores just the keys it touched. .env
+    loading stays off.
+    """
+
+    def _set(env_vars):
+        for key in [k for k in os.environ if k.startswith(_CONFIG_PREFIXES)]:
+            monkeypatch.delenv(key)
+        monkeypatch.setenv("MCP_SKIP_DOTENV", "1")
+        for key, value in env_vars.items():
+            monkeypatch.setenv(key, value)
+        load_pinot_config.cache_clear()
+
+    _set({})
+    return _set
@@ -1,5 +1,4 @@
-import os
-from unittest.mock import patch
+import json
 
 import pytest
 
@@ -20,11 +19,33 @@ _OAUTH_ENV = {
     "OAUTH_BASE_URL": "http://localhost:8080",
 }
 
+# Encoded once; the gating test replays the same initialize request several times
+_INITIALIZE_BODY = json.dumps(
+    {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "initialize",
+        "params": {
+            "protocolVersion": "2025-06-18",
+            "capabilities": {},
+            "clientInfo": {"name": "test", "version": "1"},
+        },
+    }
+).encode("utf-8")
+_MCP_HEADERS = {
+    "Accept": "application/json, text/event-stream",
+    "Content-Type": "application/json",
+}
+
 
 def _cfg(**kwargs) -> ServerConfig:
     return ServerConfig(**kwargs)
 
 
+# ServerConfig is frozen, so the static-provider tests can share one instance
+_STATIC_CONFIG = _cfg(auth_provider="static")
+
+
 class TestBuildAuth:
     """Test the pluggable auth provider dispatch."""
 
@@ -38,12 +59,11 @@ class TestBuildAuth:
         with pytest.raises(ValueError, match="Unknown auth provider"):
             build_auth(_cfg(auth_provider="does-not-exist"))
 
-    def test_oauth_provider_builds_oauthproxy(self):
+    def test_oauth_provider_builds_oauthproxy(self, clean_env):
         from fastmcp.server.auth import OAuthProxy
 
-        with patch("mcp_pinot.config.load_dotenv"):
-            with patch.dict(os.environ, _OAUTH_ENV, clear=True):
-                auth = build_auth(_cfg(auth_provider="oauth"))
+        clean_env(_OAUTH_ENV)
+        auth = build_auth(_cfg(auth_provider="oauth"))
         assert isinstance(auth, OAuthProxy)
 
     def test_custom_provider_registration(self):
@@ -63,49 +83,33 @@ class TestBuildAuth:
 class TestStaticAuth:
     """Test the static shared-secret (service-to-service) auth provider."""
 
-    def test_builds_static_token_verifier(self):
+    def test_builds_static_token_verifier(self, clean_env):
         from fastmcp.server.auth.providers.jwt import StaticTokenVerifier
 
-        with patch("mcp_pinot.config.load_dotenv"):
-            with patch.dict(os.environ, {"MCP_STATIC_TOKEN": "s3cret"}, clear=True):
-                auth = build_auth(_cfg(auth_provider="static"))
+        clean_env({"MCP_STATIC_TOKEN": "s3cret"})
+        auth = build_auth(_STATIC_CONFIG)
         assert isinstance(auth, StaticTokenVerifier)
 
-    def test_missing_token_raises(self):
-        with patch("mcp_pinot.config.load_dotenv"):
-            with patch.dict(os.environ, {}, clear=True):
-                with pytest.raises(ValueError, match="MCP_STATIC_TOKEN"):
-                    build_auth(_cfg(auth_provider="static"))
+    def test_missing_token_raises(self, clean_env):
+        clean_env({})
+        with pytest.raises(ValueError, match="MCP_STATIC_TOKEN"):
+            build_auth(_STATIC_CONFIG)
 
-    def test_blank_token_raises(self):
-        with patch("mcp_pinot.config.load_dotenv"):
-            with patch.dict(os.environ, {"MCP_STATIC_TOKEN": "   "}, clear=True):
-                with pytest.raises(ValueError, match="MCP_STATIC_TOKEN"):
-                    build_auth(_cfg(auth_provider="static"))
+    def test_blank_token_raises(self, clean_env):
+        clean_env({"MCP_STATIC_TOKEN": "   "})
+        with pytest.raises(ValueError, match="MCP_STATIC_TOKEN"):
+            build_auth(_STATIC_CONFIG)
 
     @pytest.mark.asyncio
-    async def test_static_token_gates_the_http_endpoint(self):
+    async def test_static_token_gates_the_http_endpoint(self, clean_env):
         """End-to-end: only the configured bearer token reaches the MCP endpoint."""
         from fastmcp import FastMCP
         import httpx
 
-        with patch("mcp_pinot.config.load_dotenv"):
-            with patch.dict(os.environ, {"MCP_STATIC_TOKEN": "s3cret"}, clear=True):
-                auth = build_auth(_cfg(auth_provider="static"))
+        clean_env({"MCP_STATIC_TOKEN": "s3cret"})
+        auth = build_auth(_STATIC_CONFIG)
 
         app = FastMCP("test", auth=auth).http_app(path="/mcp")
-        initialize = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "initialize",
-            "params": {
-                "protocolVersion": "2025-06-18",
-                "capabilities": {},
-                "clientInfo": {"name": "test", "version": "1"},
-            },
-        }
-        headers = {"Accept": "application/json, text/event-stream"}
-
         async with app.router.lifespan_context(app):
             transport = httpx.ASGITransport(app=app)
             async with httpx.AsyncClient(
@@ -114,7 +118,9 @@ class TestStaticAuth:
 
                 async def post(**extra):
                     response = await client.post(
-                        "/mcp", json=initialize, headers={**headers, **extra}
+                        "/mcp",
+                        content=_INITIALIZE_BODY,
+                        headers={**_MCP_HEADERS, **extra},
                     )
                     return response.status_code
 
@@ -126,19 +132,16 @@ class TestStaticAuth:
 class TestAuthProviderResolution:
     """Test how the active provider name is resolved from the environment."""
 
-    def test_defaults_to_none(self):
-        with patch("mcp_pinot.config.load_dotenv"):
-            with patch.dict(os.environ, {}, clear=True):
-                assert load_server_config().auth_provider is None
+    def test_defaults_to_none(self, clean_env):
+        clean_env({})
+        assert load_server_config().auth_provider is None
 
-    def test_oauth_enabled_backward_compat(self):
-        with patch("mcp_pinot.config.load_dotenv"):
-            with patch.dict(os.environ, {"OAUTH_ENABLED": "true"}, clear=True):
-                assert load_server_config().auth_provider == "oauth"
+    def test_oauth_enabled_backward_compat(self, clean_env):
+        clean_env({"OAUTH_ENABLED": "true"})
+        assert load_server_config().auth_provider == "oauth"
 
-    def test_explicit_auth_provider_overrides_legacy_flag(self):
+    def test_explicit_auth_provider_overrides_legacy_flag(self, clean_env):
         env = {"AUTH_PROVIDER": "StarTree", "OAUTH_ENABLED": "true"}
-        with patch("mcp_pinot.config.load_dotenv"):
-            with patch.dict(os.environ, env, clear=True):
-                # Normalized to lower-case.
-                assert load_server_config().auth_provider == "startree"
+        clean_env(env)
+        # Normalized to lower-case.
+        assert load_server_config().auth_provider == "startree"
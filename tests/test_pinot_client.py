@@ -1,14 +1,23 @@
-from unittest.mock import MagicMock, patch
+import base64
+import dataclasses
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock
 
+from pinotdb.db import Connection
 import pytest
+import requests
 
 from mcp_pinot.config import PinotConfig
-from mcp_pinot.pinot_client import PinotClient
+from mcp_pinot.pinot_client import PinotClient, _sql_table_names, _strip_sql_comments
 
+_SCHEMA_JSON = '{"schemaName": "test", "dimensionFieldSpecs": []}'
+_TABLE_CONFIG_JSON = '{"tableName": "test", "tableType": "OFFLINE"}'
 
-@pytest.fixture
+
+@pytest.fixture(scope="session")
 def mock_pinot_config():
-    """Fixture to create a mock PinotConfig."""
+    """PinotConfig shared by every test; derive variants with dataclasses.replace."""
     return PinotConfig(
         controller_url="http://localhost:9000",
         broker_host="localhost",
@@ -27,1185 +36,1166 @@ def mock_pinot_config():
 
 
 @pytest.fixture
-def mock_connection():
+def mock_connection(mocker):
     """Fixture to mock the Pinot connection."""
-    with patch("mcp_pinot.pinot_client.create_connection") as mock_connect:
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_cursor.description = [("id",), ("name",)]
-        mock_cursor.fetchall.return_value = [(1, "Test 1"), (2, "Test 2")]
-        mock_conn.cursor.return_value = mock_cursor
-        mock_connect.return_value = mock_conn
-        yield mock_conn
-
+    # Tests only read from the connection, so plain stubs are enough
+    cursor = SimpleNamespace(
+        description=[("id",), ("name",)],
+        execute=lambda query: None,
+        fetchall=lambda: [(1, "Test 1"), (2, "Test 2")],
+    )
+    mock_conn = SimpleNamespace(cursor=lambda: cursor, close=lambda: None)
+    mocker.patch("mcp_pinot.pinot_client.create_connection", return_value=mock_conn)
+    return mock_conn
+
+
+def _json_response(payload):
+    """Return a stub controller/broker 200 response whose body is ``payload``.
+
+    A plain namespace with just the Response members the client touches;
+    no test inspects calls on it, so it needs no mock machinery.
+    """
+    return SimpleNamespace(
+        json=lambda: payload,
+        raise_for_status=lambda: None,
+        status_code=200,
+        text=json.dumps(payload),
+    )
 
-@pytest.fixture
-def mock_requests():
-    """Fixture to mock the requests module."""
-    with patch("mcp_pinot.pinot_client.requests") as mock_req:
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"tables": ["table1", "table2"]}
-        mock_response.raise_for_status.return_value = None
-        mock_req.get.return_value = mock_response
-        mock_req.post.return_value = mock_response
-        mock_req.put.return_value = mock_response
-        yield mock_req
-
-
-class TestPinotClient:
-    """Test the PinotClient class"""
-
-    def test_pinot_client_init(self, mock_pinot_config):
-        """Test that PinotClient initializes correctly."""
-        pinot = PinotClient(mock_pinot_config)
-        assert pinot.config == mock_pinot_config
-        assert isinstance(pinot.insights, list)
-        assert len(pinot.insights) == 0
-        assert pinot._conn is None
-
-    def test_create_auth_headers_no_auth(self, mock_pinot_config):
-        """Test auth headers creation with no authentication."""
-        pinot = PinotClient(mock_pinot_config)
-        headers = pinot._create_auth_headers()
-
-        assert headers["accept"] == "application/json"
-        assert headers["Content-Type"] == "application/json"
-        assert "Authorization" not in headers
-
-    def test_create_auth_headers_with_token(self, mock_pinot_config):
-        """Test auth headers creation with token authentication."""
-        mock_pinot_config.token = "Bearer test_token"
-        pinot = PinotClient(mock_pinot_config)
-        headers = pinot._create_auth_headers()
-
-        assert headers["Authorization"] == "Bearer test_token"
-
-    def test_create_auth_headers_with_username_password(self, mock_pinot_config):
-        """Test auth headers creation with username/password authentication."""
-        mock_pinot_config.username = "test_user"
-        mock_pinot_config.password = "test_pass"
-        pinot = PinotClient(mock_pinot_config)
-        headers = pinot._create_auth_headers()
-
-        assert headers["Authorization"].startswith("Basic ")
-        # Decode and verify the basic auth
-        import base64
-
-        decoded = base64.b64decode(headers["Authorization"][6:]).decode()
-        assert decoded == "test_user:test_pass"
-
-    def test_create_auth_headers_with_database(self, mock_pinot_config):
-        """Test auth headers creation with database."""
-        mock_pinot_config.database = "test_db"
-        pinot = PinotClient(mock_pinot_config)
-        headers = pinot._create_auth_headers()
-
-        assert headers["database"] == "test_db"
-
-    def test_http_request_get(self, mock_pinot_config, mock_requests):
-        """Test HTTP GET request."""
-        pinot = PinotClient(mock_pinot_config)
-        response = pinot.http_request("http://test.com/api")
-
-        mock_requests.get.assert_called_once()
-        assert response == mock_requests.get.return_value
-
-    def test_http_request_post(self, mock_pinot_config, mock_requests):
-        """Test HTTP POST request."""
-        pinot = PinotClient(mock_pinot_config)
-        data = {"test": "data"}
-        response = pinot.http_request("http://test.com/api", "POST", data)
-
-        mock_requests.post.assert_called_once()
-        assert response == mock_requests.post.return_value
-
-    def test_get_connection_creates_new(self, mock_pinot_config, mock_connection):
-        """Test get_connection creates new connection when none exists."""
-        pinot = PinotClient(mock_pinot_config)
-        conn = pinot.get_connection()
-
-        assert conn == mock_connection
-        assert pinot._conn == mock_connection
-
-    def test_get_connection_reuses_existing(self, mock_pinot_config, mock_connection):
-        """Test get_connection reuses existing connection."""
-        pinot = PinotClient(mock_pinot_config)
-        pinot._conn = mock_connection
-
-        conn = pinot.get_connection()
-        assert conn == mock_connection
-
-    def test_get_connection_creates_new_on_error(self, mock_pinot_config):
-        """Test get_connection creates new connection when existing fails."""
-        with patch("mcp_pinot.pinot_client.create_connection") as mock_create:
-            with patch("mcp_pinot.pinot_client.test_connection_query") as mock_test:
-                # Mock connection that will fail the test
-                mock_conn = MagicMock()
-                mock_create.return_value = mock_conn
-
-                # Make test_connection_query fail to trigger new connection creation
-                mock_test.side_effect = Exception("Connection test failed")
-
-                pinot = PinotClient(mock_pinot_config)
-                pinot._conn = MagicMock()  # Set existing connection that will fail test
-
-                conn = pinot.get_connection()
-                assert conn == mock_conn
-                assert pinot._conn == mock_conn
-                # Should have called create_connection once to create new connection
-                mock_create.assert_called_once()
-
-    def test_test_connection_success(
-        self, mock_pinot_config, mock_connection, mock_requests
-    ):
-        """Test successful connection test."""
-        pinot = PinotClient(mock_pinot_config)
-
-        # Mock get_tables to return some tables
-        with patch.object(pinot, "get_tables") as mock_get_tables:
-            mock_get_tables.return_value = ["table1", "table2"]
-
-            result = pinot.test_connection()
-
-            assert result["connection_test"] is True
-            assert result["query_test"] is True
-            assert result["tables_test"] is True
-            assert result["error"] is None
-            assert result["tables_count"] == 2
-
-    def test_test_connection_failure(self, mock_pinot_config):
-        """Test connection test with failure."""
-        pinot = PinotClient(mock_pinot_config)
-
-        with patch.object(pinot, "get_connection") as mock_get_conn:
-            mock_get_conn.side_effect = Exception("Connection failed")
-
-            result = pinot.test_connection()
-
-            assert result["connection_test"] is False
-            assert result["query_test"] is False
-            assert result["tables_test"] is False
-            assert result["error"] == "Connection failed"
-
-    def test_execute_query_http_success(self, mock_pinot_config, mock_requests):
-        """Test successful HTTP query execution."""
-        pinot = PinotClient(mock_pinot_config)
-
-        # Mock HTTP response
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            "resultTable": {
-                "dataSchema": {"columnNames": ["id", "name"]},
-                "rows": [[1, "Test 1"], [2, "Test 2"]],
-            }
-        }
-        mock_requests.post.return_value = mock_response
 
-        result = pinot.execute_query_http("SELECT * FROM test_table")
+@pytest.fixture(scope="module")
+def _patched_session(module_mocker):
+    """Swap requests.Session for a spec'd mock once for the whole module."""
+    mock_session = MagicMock(spec=requests.Session)
+    module_mocker.patch(
+        "mcp_pinot.pinot_client.requests.Session", return_value=mock_session
+    )
+    return mock_session
 
-        assert len(result) == 2
-        assert result[0]["id"] == 1
-        assert result[0]["name"] == "Test 1"
-        assert result[1]["id"] == 2
-        assert result[1]["name"] == "Test 2"
 
-    def test_execute_query_http_with_exceptions(self, mock_pinot_config, mock_requests):
-        """Test HTTP query execution with exceptions in response."""
-        pinot = PinotClient(mock_pinot_config)
+@pytest.fixture
+def mock_requests(_patched_session):
+    """Fixture to mock the HTTP session PinotClient sends its requests through.
+
+    Only requests.Session is replaced, so requests.exceptions stays real and
+    the client's except clauses match what the library actually raises. The
+    patch is installed once per module; each test gets the session reset.
+    """
+    _patched_session.reset_mock(return_value=True, side_effect=True)
+    mock_response = _json_response({"tables": ["table1", "table2"]})
+    _patched_session.get.return_value = mock_response
+    _patched_session.post.return_value = mock_response
+    _patched_session.put.return_value = mock_response
+    return _patched_session
+
+
+@pytest.fixture(scope="module")
+def standard_query_response():
+    """Single-column broker response shared by the successful query cases."""
+    return _json_response(
+        {"resultTable": {"dataSchema": {"columnNames": ["col1"]}, "rows": [["data"]]}}
+    )
 
-        # Mock HTTP response with exceptions
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            "exceptions": ["Query error: Table not found"]
-        }
-        mock_requests.post.return_value = mock_response
 
-        with pytest.raises(Exception, match="Query error"):
-            pinot.execute_query_http("SELECT * FROM nonexistent_table")
+@pytest.fixture
+def pinot(mock_pinot_config):
+    """A fresh PinotClient over the default, unfiltered test configuration.
 
-    def test_execute_query_http_no_result_table(self, mock_pinot_config, mock_requests):
-        """Test HTTP query execution with no result table."""
-        pinot = PinotClient(mock_pinot_config)
+    Function-scoped on purpose: a client caches its connection, HTTP session
+    and auth headers, and reload_table_filters() swaps its filters.
+    """
+    return PinotClient(mock_pinot_config)
 
-        # Mock HTTP response without resultTable
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"status": "success"}
-        mock_requests.post.return_value = mock_response
 
-        result = pinot.execute_query_http("SELECT * FROM test_table")
-        assert result == []
+def test_pinot_client_init(mock_pinot_config):
+    """Test that PinotClient initializes correctly."""
+    pinot = PinotClient(mock_pinot_config)
+    assert pinot.config == mock_pinot_config
+    assert isinstance(pinot.insights, list)
+    assert len(pinot.insights) == 0
+    assert pinot._conn is None
 
-    def test_execute_query_http_fallback_to_pinotdb(
-        self, mock_pinot_config, mock_connection
-    ):
-        """Test execute_query falls back to PinotDB when HTTP fails."""
-        pinot = PinotClient(mock_pinot_config)
 
-        # Mock HTTP request to fail
-        with patch.object(pinot, "http_request") as mock_http_request:
-            mock_http_request.side_effect = Exception("HTTP failed")
+def test_create_auth_headers_no_auth(pinot):
+    """Test auth headers creation with no authentication."""
+    headers = pinot._create_auth_headers()
 
-            # Mock PinotDB execution
-            with patch.object(pinot, "execute_query_pinotdb") as mock_pinotdb:
-                mock_pinotdb.return_value = [{"id": 1, "name": "Test"}]
+    assert headers["accept"] == "application/json"
+    assert headers["Content-Type"] == "application/json"
+    assert "Authorization" not in headers
 
-                result = pinot.execute_query("SELECT * FROM test_table")
 
-                assert result == [{"id": 1, "name": "Test"}]
-                mock_pinotdb.assert_called_once()
+def test_create_auth_headers_with_token(mock_pinot_config):
+    """Test auth headers creation with token authentication."""
+    mock_pinot_config = dataclasses.replace(
+        mock_pinot_config, token="Bearer test_token"
+    )
+    pinot = PinotClient(mock_pinot_config)
+    headers = pinot._create_auth_headers()
 
-    def test_execute_query_both_methods_fail(self, mock_pinot_config):
-        """Test execute_query when both HTTP and PinotDB fail."""
-        pinot = PinotClient(mock_pinot_config)
+    assert headers["Authorization"] == "Bearer test_token"
 
-        with patch.object(pinot, "http_request") as mock_http_request:
-            mock_http_request.side_effect = Exception("HTTP failed")
 
-            with patch.object(pinot, "execute_query_pinotdb") as mock_pinotdb:
-                mock_pinotdb.side_effect = Exception("PinotDB failed")
+def test_create_auth_headers_with_username_password(mock_pinot_config):
+    """Test auth headers creation with username/password authentication."""
+    mock_pinot_config = dataclasses.replace(
+        mock_pinot_config, username="test_user", password="test_pass"
+    )
+    pinot = PinotClient(mock_pinot_config)
+    headers = pinot._create_auth_headers()
 
-                # The actual exception raised is the last one (PinotDB failed)
-                with pytest.raises(Exception, match="PinotDB failed"):
-                    pinot.execute_query("SELECT * FROM test_table")
+    assert headers["Authorization"].startswith("Basic ")
+    # Decode and verify the basic auth
+    decoded = base64.b64decode(headers["Authorization"][6:]).decode()
+    assert decoded == "test_user:test_pass"
 
-    def test_preprocess_query_removes_database_prefix(self, mock_pinot_config):
-        """Test query preprocessing removes database prefix."""
-        mock_pinot_config.database = "test_db"
-        pinot = PinotClient(mock_pinot_config)
 
-        query = "SELECT * FROM test_db.my_table"
-        processed = pinot.preprocess_query(query)
+def test_create_auth_headers_with_database(mock_pinot_config):
+    """Test auth headers creation with database."""
+    mock_pinot_config = dataclasses.replace(mock_pinot_config, database="test_db")
+    pinot = PinotClient(mock_pinot_config)
+    headers = pinot._create_auth_headers()
 
-        assert "test_db." not in processed
-        assert "my_table" in processed
+    assert headers["database"] == "test_db"
 
-    def test_preprocess_query_adds_timeout(self, mock_pinot_config):
-        """Test query preprocessing adds timeout option."""
-        pinot = PinotClient(mock_pinot_config)
 
-        query = "SELECT * FROM my_table"
-        processed = pinot.preprocess_query(query)
+def test_create_auth_headers_built_once(pinot, mocker):
+    """Test auth headers are built once and handed out as copies."""
+    build = mocker.spy(pinot, "_build_auth_headers")
 
-        assert "OPTION(timeoutMs=60000)" in processed
+    headers = pinot._create_auth_headers()
+    headers["Content-Type"] = "text/plain"
+    again = pinot._create_auth_headers()
 
-    def test_preprocess_query_preserves_existing_timeout(self, mock_pinot_config):
-        """Test query preprocessing preserves existing timeout."""
-        pinot = PinotClient(mock_pinot_config)
+    build.assert_called_once()
+    assert again["Content-Type"] == "application/json"
 
-        query = "SELECT * FROM my_table OPTION(timeoutMs=30000)"
-        processed = pinot.preprocess_query(query)
 
-        assert processed == query  # Should not be modified
+def test_http_request_get(pinot, mock_requests):
+    """Test HTTP GET request."""
+    response = pinot.http_request("http://test.com/api")
 
-    def test_execute_query_pinotdb_success(self, mock_pinot_config, mock_connection):
-        """Test successful PinotDB query execution."""
-        pinot = PinotClient(mock_pinot_config)
+    mock_requests.get.assert_called_once()
+    assert response == mock_requests.get.return_value
 
-        with patch.object(pinot, "get_connection") as mock_get_conn:
-            mock_get_conn.return_value = mock_connection
 
-            result = pinot.execute_query_pinotdb("SELECT * FROM test_table")
+def test_http_request_post(pinot, mock_requests):
+    """Test HTTP POST request."""
+    data = {"test": "data"}
+    response = pinot.http_request("http://test.com/api", "POST", data)
 
-            assert len(result) == 2
-            assert result[0]["id"] == 1
-            assert result[0]["name"] == "Test 1"
+    mock_requests.post.assert_called_once()
+    assert response == mock_requests.post.return_value
 
-    def test_execute_query_pinotdb_error_resets_connection(self, mock_pinot_config):
-        """Test PinotDB query execution resets connection on error."""
-        pinot = PinotClient(mock_pinot_config)
-        pinot._conn = MagicMock()
 
-        with patch.object(pinot, "get_connection") as mock_get_conn:
-            mock_get_conn.side_effect = Exception("Connection failed")
+def test_http_requests_share_one_session(mock_pinot_config, mocker):
+    """Test that requests reuse the client's pooled session."""
+    session_cls = mocker.patch("mcp_pinot.pinot_client.requests.Session")
+    pinot = PinotClient(mock_pinot_config)
+    session_cls.assert_not_called()
 
-            with pytest.raises(Exception, match="Connection failed"):
-                pinot.execute_query_pinotdb("SELECT * FROM test_table")
+    pinot.http_request("http://test.com/api")
+    pinot.http_request("http://test.com/api", "POST", {"test": "data"})
 
-            assert pinot._conn is None
+    session_cls.assert_called_once()
 
-    def test_get_tables(self, mock_pinot_config, mock_requests):
-        """Test get_tables method."""
-        pinot = PinotClient(mock_pinot_config)
 
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"tables": ["table1", "table2"]}
-        mock_requests.get.return_value = mock_response
+def test_get_connection_creates_new(pinot, mock_connection):
+    """Test get_connection creates new connection when none exists."""
+    conn = pinot.get_connection()
 
-        tables = pinot.get_tables()
+    assert conn == mock_connection
+    assert pinot._conn == mock_connection
 
-        assert tables == ["table1", "table2"]
-        mock_requests.get.assert_called_once()
 
-    def test_get_table_detail(self, mock_pinot_config, mock_requests):
-        """Test get_table_detail method."""
-        pinot = PinotClient(mock_pinot_config)
+def test_get_connection_reuses_existing(pinot, mock_connection):
+    """Test get_connection reuses existing connection."""
+    pinot._conn = mock_connection
 
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"tableName": "test_table", "columnCount": 5}
-        mock_requests.get.return_value = mock_response
+    conn = pinot.get_connection()
+    assert conn == mock_connection
 
-        detail = pinot.get_table_detail("test_table")
 
-        assert detail["tableName"] == "test_table"
-        assert detail["columnCount"] == 5
+def test_get_connection_creates_new_on_error(mock_pinot_config, mocker):
+    """Test get_connection creates new connection when existing fails."""
+    mock_conn = MagicMock(spec=Connection)
+    mock_create = mocker.patch(
+        "mcp_pinot.pinot_client.create_connection", return_value=mock_conn
+    )
+    # Make test_connection_query fail to trigger new connection creation
+    mocker.patch(
+        "mcp_pinot.pinot_client.test_connection_query",
+        side_effect=Exception("Connection test failed"),
+    )
 
-    def test_get_segments(self, mock_pinot_config, mock_requests):
-        """Test get_segments method."""
-        pinot = PinotClient(mock_pinot_config)
+    pinot = PinotClient(mock_pinot_config)
+    # Set existing connection that will fail test
+    pinot._conn = MagicMock(spec=Connection)
 
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"segments": ["segment1", "segment2"]}
-        mock_requests.get.return_value = mock_response
+    conn = pinot.get_connection()
+    assert conn == mock_conn
+    assert pinot._conn == mock_conn
+    # Should have called create_connection once to create new connection
+    mock_create.assert_called_once()
 
-        segments = pinot.get_segments("test_table")
 
-        assert segments["segments"] == ["segment1", "segment2"]
+def test_test_connection_success(pinot, mock_connection, mock_requests, mocker):
+    """Test successful connection test."""
+    # Mock get_tables to return some tables
+    mocker.patch.object(pinot, "get_tables", return_value=["table1", "table2"])
 
-    def test_get_segment_metadata_detail(self, mock_pinot_config, mock_requests):
-        """Test get_segment_metadata_detail method."""
-        pinot = PinotClient(mock_pinot_config)
+    result = pinot.test_connection()
 
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"metadata": "test_metadata"}
-        mock_requests.get.return_value = mock_response
+    assert result["connection_test"] is True
+    assert result["query_test"] is True
+    assert result["tables_test"] is True
+    assert result["error"] is None
+    assert result["tables_count"] == 2
 
-        metadata = pinot.get_segment_metadata_detail("test_table")
 
-        assert metadata["metadata"] == "test_metadata"
+def test_test_connection_failure(pinot, mocker):
+    """Test connection test with failure."""
+    mocker.patch.object(
+        pinot, "get_connection", side_effect=Exception("Connection failed")
+    )
 
-    def test_get_index_column_detail_success(self, mock_pinot_config, mock_requests):
-        """Test get_index_column_detail method with success."""
-        pinot = PinotClient(mock_pinot_config)
+    result = pinot.test_connection()
 
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"indexes": ["index1", "index2"]}
-        mock_requests.get.return_value = mock_response
+    assert result["connection_test"] is False
+    assert result["query_test"] is False
+    assert result["tables_test"] is False
+    assert result["error"] == "Connection failed"
 
-        detail = pinot.get_index_column_detail("test_table", "segment1")
 
-        assert detail["indexes"] == ["index1", "index2"]
+def test_execute_query_http_success(pinot, mock_requests):
+    """Test successful HTTP query execution."""
+    # Mock HTTP response
+    mock_requests.post.return_value = _json_response(
+        {
+            "resultTable": {
+                "dataSchema": {"columnNames": ["id", "name"]},
+                "rows": [[1, "Test 1"], [2, "Test 2"]],
+            }
+        }
+    )
 
-    def test_get_index_column_detail_not_found(self, mock_pinot_config, mock_requests):
-        """Test get_index_column_detail method when not found."""
-        pinot = PinotClient(mock_pinot_config)
+    result = pinot.execute_query_http("SELECT * FROM test_table")
 
-        mock_requests.get.side_effect = Exception("Not found")
+    assert len(result) == 2
+    assert result[0]["id"] == 1
+    assert result[0]["name"] == "Test 1"
+    assert result[1]["id"] == 2
+    assert result[1]["name"] == "Test 2"
 
-        with pytest.raises(ValueError, match="Index column detail not found"):
-            pinot.get_index_column_detail("test_table", "segment1")
 
-    def test_get_tableconfig_schema_detail(self, mock_pinot_config, mock_requests):
-        """Test get_tableconfig_schema_detail method."""
-        pinot = PinotClient(mock_pinot_config)
+def test_execute_query_http_with_exceptions(pinot, mock_requests):
+    """Test HTTP query execution with exceptions in response."""
+    # Mock HTTP response with exceptions
+    mock_requests.post.return_value = _json_response(
+        {"exceptions": ["Query error: Table not found"]}
+    )
 
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"config": "test_config"}
-        mock_requests.get.return_value = mock_response
+    with pytest.raises(Exception, match="Query error"):
+        pinot.execute_query_http("SELECT * FROM nonexistent_table")
 
-        config = pinot.get_tableconfig_schema_detail("test_table")
 
-        assert config["config"] == "test_config"
+def test_execute_query_http_no_result_table(pinot, mock_requests):
+    """Test HTTP query execution with no result table."""
+    # Mock HTTP response without resultTable
+    mock_requests.post.return_value = _json_response({"status": "success"})
 
-    def test_create_schema(self, mock_pinot_config, mock_requests):
-        """Test create_schema method."""
-        pinot = PinotClient(mock_pinot_config)
+    result = pinot.execute_query_http("SELECT * FROM test_table")
+    assert result == []
 
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"status": "created"}
-        mock_requests.post.return_value = mock_response
 
-        schema_json = '{"schemaName": "test", "dimensionFieldSpecs": []}'
-        result = pinot.create_schema(schema_json)
+def test_execute_query_http_fallback_to_pinotdb(pinot, mock_connection, mocker):
+    """Test execute_query falls back to PinotDB when HTTP fails."""
+    mocker.patch.object(pinot, "http_request", side_effect=Exception("HTTP failed"))
+    mock_pinotdb = mocker.patch.object(
+        pinot, "execute_query_pinotdb", return_value=[{"id": 1, "name": "Test"}]
+    )
 
-        assert result["status"] == "created"
+    result = pinot.execute_query("SELECT * FROM test_table")
 
-    def test_update_schema(self, mock_pinot_config, mock_requests):
-        """Test update_schema method."""
-        pinot = PinotClient(mock_pinot_config)
+    assert result == [{"id": 1, "name": "Test"}]
+    mock_pinotdb.assert_called_once()
 
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"status": "updated"}
-        mock_requests.put.return_value = mock_response
 
-        schema_json = '{"schemaName": "test", "dimensionFieldSpecs": []}'
-        result = pinot.update_schema("test", schema_json)
+def test_execute_query_both_methods_fail(pinot, mocker):
+    """Test execute_query when both HTTP and PinotDB fail."""
+    mocker.patch.object(pinot, "http_request", side_effect=Exception("HTTP failed"))
+    mocker.patch.object(
+        pinot, "execute_query_pinotdb", side_effect=Exception("PinotDB failed")
+    )
 
-        assert result["status"] == "updated"
+    # The actual exception raised is the last one (PinotDB failed)
+    with pytest.raises(Exception, match="PinotDB failed"):
+        pinot.execute_query("SELECT * FROM test_table")
 
-    def test_get_schema(self, mock_pinot_config, mock_requests):
-        """Test get_schema method."""
-        pinot = PinotClient(mock_pinot_config)
 
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"schema": "test_schema"}
-        mock_requests.get.return_value = mock_response
+def test_preprocess_query_removes_database_prefix(mock_pinot_config):
+    """Test query preprocessing removes database prefix."""
+    mock_pinot_config = dataclasses.replace(mock_pinot_config, database="test_db")
+    pinot = PinotClient(mock_pinot_config)
 
-        schema = pinot.get_schema("test")
+    query = "SELECT * FROM test_db.my_table"
+    processed = pinot.preprocess_query(query)
 
-        assert schema["schema"] == "test_schema"
+    assert "test_db." not in processed
+    assert "my_table" in processed
 
-    def test_create_table_config(self, mock_pinot_config, mock_requests):
-        """Test create_table_config method."""
-        pinot = PinotClient(mock_pinot_config)
 
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"status": "created"}
-        mock_requests.post.return_value = mock_response
+def test_preprocess_query_adds_timeout(pinot):
+    """Test query preprocessing adds timeout option."""
+    query = "SELECT * FROM my_table"
+    processed = pinot.preprocess_query(query)
 
-        config_json = '{"tableName": "test", "tableType": "OFFLINE"}'
-        result = pinot.create_table_config(config_json)
+    assert "OPTION(timeoutMs=60000)" in processed
 
-        assert result["status"] == "created"
 
-    def test_update_table_config(self, mock_pinot_config, mock_requests):
-        """Test update_table_config method."""
-        pinot = PinotClient(mock_pinot_config)
+def test_preprocess_query_preserves_existing_timeout(pinot):
+    """Test query preprocessing preserves existing timeout."""
+    query = "SELECT * FROM my_table OPTION(timeoutMs=30000)"
+    processed = pinot.preprocess_query(query)
 
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"status": "updated"}
-        mock_requests.put.return_value = mock_response
+    assert processed == query  # Should not be modified
 
-        config_json = '{"tableName": "test", "tableType": "OFFLINE"}'
-        result = pinot.update_table_config("test", config_json)
 
-        assert result["status"] == "updated"
+def test_execute_query_pinotdb_success(pinot, mock_connection, mocker):
+    """Test successful PinotDB query execution."""
+    mocker.patch.object(pinot, "get_connection", return_value=mock_connection)
 
-    def test_get_table_config(self, mock_pinot_config, mock_requests):
-        """Test get_table_config method."""
-        pinot = PinotClient(mock_pinot_config)
+    result = pinot.execute_query_pinotdb("SELECT * FROM test_table")
 
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"OFFLINE": {"config": "test"}}
-        mock_requests.get.return_value = mock_response
+    assert len(result) == 2
+    assert result[0]["id"] == 1
+    assert result[0]["name"] == "Test 1"
 
-        config = pinot.get_table_config("test", "OFFLINE")
 
-        assert config["config"] == "test"
+def test_execute_query_pinotdb_error_resets_connection(pinot, mocker):
+    """Test PinotDB query execution resets connection on error."""
+    pinot._conn = MagicMock(spec=Connection)
+    mocker.patch.object(
+        pinot, "get_connection", side_effect=Exception("Connection failed")
+    )
 
-    def test_get_table_config_no_type(self, mock_pinot_config, mock_requests):
-        """Test get_table_config method without table type."""
-        pinot = PinotClient(mock_pinot_config)
+    with pytest.raises(Exception, match="Connection failed"):
+        pinot.execute_query_pinotdb("SELECT * FROM test_table")
+
+    assert pinot._conn is None
+
+
+def test_get_tables(pinot, mock_requests):
+    """Test get_tables method."""
+    mock_requests.get.return_value = _json_response({"tables": ["table1", "table2"]})
+
+    tables = pinot.get_tables()
+
+    assert tables == ["table1", "table2"]
+    mock_requests.get.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    ("method", "args", "verb", "payload", "key", "expected"),
+    [
+        (
+            "get_table_detail",
+            ("test_table",),
+            "get",
+            {"tableName": "test_table", "columnCount": 5},
+            "columnCount",
+            5,
+        ),
+        (
+            "get_segments",
+            ("test_table",),
+            "get",
+            {"segments": ["segment1", "segment2"]},
+            "segments",
+            ["segment1", "segment2"],
+        ),
+        (
+            "get_segment_metadata_detail",
+            ("test_table",),
+            "get",
+            {"metadata": "test_metadata"},
+            "metadata",
+            "test_metadata",
+        ),
+        (
+            "get_index_column_detail",
+            ("test_table", "segment1"),
+            "get",
+            {"indexes": ["index1", "index2"]},
+            "indexes",
+            ["index1", "index2"],
+        ),
+        (
+            "get_tableconfig_schema_detail",
+            ("test_table",),
+            "get",
+            {"config": "test_config"},
+            "config",
+            "test_config",
+        ),
+        (
+            "create_schema",
+            (_SCHEMA_JSON,),
+            "post",
+            {"status": "created"},
+            "status",
+            "created",
+        ),
+        (
+            "update_schema",
+            ("test", _SCHEMA_JSON),
+            "put",
+            {"status": "updated"},
+            "status",
+            "updated",
+        ),
+        (
+            "get_schema",
+            ("test",),
+            "get",
+            {"schema": "test_schema"},
+            "schema",
+            "test_schema",
+        ),
+        (
+            "create_table_config",
+            (_TABLE_CONFIG_JSON,),
+            "post",
+            {"status": "created"},
+            "status",
+            "created",
+        ),
+        (
+            "update_table_config",
+            ("test", _TABLE_CONFIG_JSON),
+            "put",
+            {"status": "updated"},
+            "status",
+            "updated",
+        ),
+    ],
+)
+def test_controller_call_returns_response_json(
+    pinot,
+    mock_requests,
+    method,
+    args,
+    verb,
+    payload,
+    key,
+    expected,
+):
+    """Test controller wrappers return the parsed response body."""
+    getattr(mock_requests, verb).return_value = _json_response(payload)
+
+    result = getattr(pinot, method)(*args)
+
+    assert result[key] == expected
+    getattr(mock_requests, verb).assert_called_once()
+
+
+def test_get_index_column_detail_not_found(pinot, mock_requests):
+    """Test get_index_column_detail method when not found."""
+    mock_requests.get.side_effect = Exception("Not found")
+
+    with pytest.raises(ValueError, match="Index column detail not found"):
+        pinot.get_index_column_detail("test_table", "segment1")
+
+
+@pytest.mark.parametrize(
+    ("args", "expected"),
+    [
+        # A table type selects that half of the response
+        (("test", "OFFLINE"), {"config": "test"}),
+        # Without one the whole response is returned
+        (("test",), {"OFFLINE": {"config": "test"}}),
+    ],
+    ids=["with-type", "no-type"],
+)
+def test_get_table_config(pinot, mock_requests, args, expected):
+    """Test get_table_config method with and without a table type."""
+    mock_requests.get.return_value = _json_response({"OFFLINE": {"config": "test"}})
+
+    assert pinot.get_table_config(*args) == expected
+
+
+@pytest.mark.parametrize(
+    ("included", "expected"),
+    [(None, False), ([], False), (["table1", "table2*"], True)],
+    ids=["none", "empty-list", "patterns"],
+)
+def test_is_table_filtering_enabled(mock_pinot_config, included, expected):
+    """Test _is_table_filtering_enabled only for a non-empty filter."""
+    mock_pinot_config = dataclasses.replace(mock_pinot_config, included_tables=included)
+    pinot = PinotClient(mock_pinot_config)
+
+    assert pinot._is_table_filtering_enabled() is expected
+
+
+@pytest.mark.parametrize(
+    ("included", "tables", "expected"),
+    [
+        # No filter configured: everything passes
+        (None, ["table1", "table2", "table3"], ["table1", "table2", "table3"]),
+        # Glob patterns and exact names, order preserved
+        (
+            ["prod_*", "important_table"],
+            ["prod_users", "prod_orders", "dev_users", "important_table"],
+            ["prod_users", "prod_orders", "important_table"],
+        ),
+        # Tables outside the filter are dropped
+        (
+            ["allowed_table"],
+            ["allowed_table", "excluded_table", "another_excluded"],
+            ["allowed_table"],
+        ),
+        # Empty input stays empty
+        (["prod_*"], [], []),
+    ],
+    ids=["no-filter", "patterns", "excludes-non-matching", "empty-list"],
+)
+def test_filter_tables(mock_pinot_config, included, tables, expected):
+    """Test that _filter_tables applies the configured filter."""
+    mock_pinot_config = dataclasses.replace(mock_pinot_config, included_tables=included)
+    pinot = PinotClient(mock_pinot_config)
+
+    assert pinot._filter_tables(tables) == expected
+
+
+def test_compiled_pattern_reused(mock_pinot_config, tmp_path):
+    """Test included_tables is compiled once and recompiled only on reload."""
+    mock_pinot_config = dataclasses.replace(
+        mock_pinot_config, included_tables=["prod_*"]
+    )
+    filter_file = tmp_path / "filters.yaml"
+    filter_file.write_text("included_tables:\n  - dev_*\n")
+    mock_pinot_config = dataclasses.replace(
+        mock_pinot_config, table_filter_file=str(filter_file)
+    )
+    pinot = PinotClient(mock_pinot_config)
+    compiled = pinot._included_re
 
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"OFFLINE": {"config": "test"}}
-        mock_requests.get.return_value = mock_response
+    assert pinot._filter_tables(["prod_a", "dev_a"]) == ["prod_a"]
+    assert pinot._filter_tables(["prod_b"]) == ["prod_b"]
+    assert pinot._included_re is compiled
 
-        config = pinot.get_table_config("test")
+    pinot.reload_table_filters()
 
-        assert "OFFLINE" in config
-        assert config["OFFLINE"]["config"] == "test"
+    assert pinot._included_re is not compiled
+    assert pinot._filter_tables(["prod_a", "dev_a"]) == ["dev_a"]
 
-    def test_is_table_filtering_enabled_with_none(self, mock_pinot_config):
-        """Test _is_table_filtering_enabled returns False with None."""
-        mock_pinot_config.included_tables = None
-        pinot = PinotClient(mock_pinot_config)
 
-        assert pinot._is_table_filtering_enabled() is False
+def test_get_tables_with_filtering(mock_pinot_config, mock_requests):
+    """Test that get_tables applies filtering when configured."""
+    mock_pinot_config = dataclasses.replace(
+        mock_pinot_config, included_tables=["prod_*"]
+    )
+    pinot = PinotClient(mock_pinot_config)
 
-    def test_is_table_filtering_enabled_with_empty_list(self, mock_pinot_config):
-        """Test _is_table_filtering_enabled returns False with empty list."""
-        mock_pinot_config.included_tables = []
-        pinot = PinotClient(mock_pinot_config)
+    mock_requests.get.return_value = _json_response(
+        {"tables": ["prod_users", "prod_orders", "dev_users"]}
+    )
 
-        assert pinot._is_table_filtering_enabled() is False
+    tables = pinot.get_tables()
 
-    def test_is_table_filtering_enabled_with_patterns(self, mock_pinot_config):
-        """Test _is_table_filtering_enabled returns True with patterns."""
-        mock_pinot_config.included_tables = ["table1", "table2*"]
-        pinot = PinotClient(mock_pinot_config)
+    assert tables == ["prod_users", "prod_orders"]
+    assert "dev_users" not in tables
 
-        assert pinot._is_table_filtering_enabled() is True
 
-    def test_filter_tables_no_filter_configured(self, mock_pinot_config):
-        """Test that _filter_tables returns all tables when no filter configured."""
-        pinot = PinotClient(mock_pinot_config)
-        tables = ["table1", "table2", "table3"]
+@pytest.mark.parametrize(
+    ("included", "query", "expected"),
+    [
+        (
+            ["allowed_table", "another_allowed"],
+            "SELECT * FROM unauthorized_table",
+            None,
+        ),
+        (
+            ["allowed_table"],
+            """
+            SELECT a.*, b.name
+            FROM allowed_table a
+            JOIN unauthorized_table b ON a.id = b.id
+            """,
+            None,
+        ),
+        (
+            ["allowed_table"],
+            """
+            SELECT * FROM unauthorized1
+            JOIN unauthorized2 ON unauthorized1.id = unauthorized2.id
+            """,
+            None,
+        ),
+        (
+            ["allowed_table"],
+            """
+            SELECT * FROM allowed_table
+            WHERE id IN (SELECT id FROM unauthorized_table WHERE active = 1)
+            """,
+            None,
+        ),
+        (
+            ["allowed"],
+            "SELECT * FROM allowed WHERE c = '\\' -- '\n OR c2 = '\\' "
+            "OR c3 IN (SELECT 1 FROM secret) OR c4 = 'q'",
+            None,
+        ),
+        (
+            ["table1", "table2"],
+            "SELECT * FROM table1 JOIN table2 ON table1.id = table2.id",
+            [{"col1": "data"}],
+        ),
+        (
+            ["allowed_table", "another_allowed"],
+            """
+            SELECT * FROM allowed_table
+            WHERE id IN (SELECT id FROM another_allowed WHERE active = 1)
+            """,
+            [{"col1": "data"}],
+        ),
+        (
+            ["allowed_table"],
+            "SELECT id, name FROM allowed_table GROUP BY id, name",
+            [{"col1": "data"}],
+        ),
+        (None, "SELECT * FROM any_table_name", [{"col1": "data"}]),
+    ],
+    ids=[
+        "blocks-from",
+        "blocks-join",
+        "blocks-multiple",
+        "blocks-subquery",
+        "blocks-backslash-quote-comment",
+        "allows-join",
+        "allows-subquery",
+        "allows-multi-column-select",
+        "allows-all-without-filter",
+    ],
+)
+def test_execute_query_table_authorization(
+    mock_pinot_config,
+    mock_requests,
+    standard_query_response,
+    included,
+    query,
+    expected,
+):
+    """Test execute_query checks every referenced table against the filter.
+
+    ``expected`` of None means the query must be rejected before it is sent.
+    """
+    mock_pinot_config = dataclasses.replace(mock_pinot_config, included_tables=included)
+    pinot = PinotClient(mock_pinot_config)
+    mock_requests.post.return_value = standard_query_response
+
+    if expected is None:
+        with pytest.raises(ValueError, match="unauthorized tables"):
+            pinot.execute_query(query)
+        mock_requests.post.assert_not_called()
+    else:
+        assert pinot.execute_query(query) == expected
 
-        result = pinot._filter_tables(tables)
 
-        assert result == tables
+def test_execute_query_rejects_non_select_when_no_filter(pinot, mock_requests):
+    """Test execute_query rejects write statements even without table filtering."""
+    with pytest.raises(ValueError, match="Only read-only SELECT queries"):
+        pinot.execute_query("DELETE FROM any_table_name WHERE id = 1")
 
-    def test_filter_tables_with_patterns(self, mock_pinot_config):
-        """Test that _filter_tables applies patterns correctly."""
-        mock_pinot_config.included_tables = ["prod_*", "important_table"]
-        pinot = PinotClient(mock_pinot_config)
-        tables = ["prod_users", "prod_orders", "dev_users", "important_table"]
+    mock_requests.post.assert_not_called()
 
-        result = pinot._filter_tables(tables)
 
-        assert result == ["prod_users", "prod_orders", "important_table"]
+def test_execute_query_rejects_stacked_statement(pinot, mock_requests):
+    """Test execute_query rejects stacked statements after a SELECT."""
+    with pytest.raises(ValueError, match="Only a single read-only SELECT statement"):
+        pinot.execute_query("SELECT * FROM test_table; DROP TABLE test_table")
 
-    def test_filter_tables_excludes_non_matching(self, mock_pinot_config):
-        """Test that _filter_tables excludes tables not in the filter."""
-        mock_pinot_config.included_tables = ["allowed_table"]
-        pinot = PinotClient(mock_pinot_config)
-        tables = ["allowed_table", "excluded_table", "another_excluded"]
+    mock_requests.post.assert_not_called()
 
-        result = pinot._filter_tables(tables)
 
-        assert result == ["allowed_table"]
-        assert "excluded_table" not in result
-        assert "another_excluded" not in result
+def test_execute_query_rejects_obfuscated_destructive_keyword(pinot, mock_requests):
+    """Test execute_query rejects destructive keywords hidden by comments."""
+    with pytest.raises(ValueError, match="Only a single read-only SELECT statement"):
+        pinot.execute_query("SELECT * FROM test_table; DR/**/OP TABLE test_table")
 
-    def test_filter_tables_empty_list(self, mock_pinot_config):
-        """Test that _filter_tables handles empty table list."""
-        mock_pinot_config.included_tables = ["prod_*"]
-        pinot = PinotClient(mock_pinot_config)
+    mock_requests.post.assert_not_called()
 
-        result = pinot._filter_tables([])
 
-        assert result == []
+def test_execute_query_rejects_prohibited_keyword_in_cte(pinot, mock_requests):
+    """Test execute_query rejects write operations embedded in a WITH query."""
+    with pytest.raises(ValueError, match="prohibited keyword UPDATE"):
+        pinot.execute_query(
+            "WITH cte AS (UPDATE test_table SET name = 'x') SELECT * FROM cte"
+        )
 
-    def test_get_tables_with_filtering(self, mock_pinot_config, mock_requests):
-        """Test that get_tables applies filtering when configured."""
-        mock_pinot_config.included_tables = ["prod_*"]
-        pinot = PinotClient(mock_pinot_config)
+    mock_requests.post.assert_not_called()
 
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            "tables": ["prod_users", "prod_orders", "dev_users"]
-        }
-        mock_requests.get.return_value = mock_response
 
-        tables = pinot.get_tables()
+def test_execute_query_rejects_with_without_top_level_select(pinot, mock_requests):
+    """Test WITH queries must resolve to a top-level SELECT."""
+    with pytest.raises(ValueError, match="WITH queries must resolve"):
+        pinot.execute_query("WITH cte AS (SELECT * FROM test_table) VALUES (1)")
 
-        assert tables == ["prod_users", "prod_orders"]
-        assert "dev_users" not in tables
+    mock_requests.post.assert_not_called()
 
-    def test_execute_query_blocks_unauthorized_table_in_from(
-        self, mock_pinot_config, mock_requests
-    ):
-        """Test execute_query blocks unauthorized table in FROM clause."""
-        mock_pinot_config.included_tables = ["allowed_table", "another_allowed"]
-        pinot = PinotClient(mock_pinot_config)
 
-        # Mock the HTTP response
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
+def test_execute_query_allows_trailing_semicolon_comments_and_string_semicolons(
+    pinot, mock_requests
+):
+    """Test read-only validation keeps string semicolons and strips comments."""
+    mock_requests.post.return_value = _json_response(
+        {
             "resultTable": {
-                "dataSchema": {"columnNames": ["col1"]},
-                "rows": [["data"]],
+                "dataSchema": {"columnNames": ["literal"]},
+                "rows": [["; DROP TABLE test_table"]],
             }
         }
-        mock_requests.post.return_value = mock_response
+    )
 
-        # Query with unauthorized table should raise ValueError
-        with pytest.raises(ValueError, match="unauthorized tables"):
-            pinot.execute_query("SELECT * FROM unauthorized_table")
-
-    def test_execute_query_blocks_unauthorized_table_in_join(
-        self, mock_pinot_config, mock_requests
-    ):
-        """Test execute_query blocks unauthorized table in JOIN clause."""
-        mock_pinot_config.included_tables = ["allowed_table"]
-        pinot = PinotClient(mock_pinot_config)
-
-        # Mock the HTTP response
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            "resultTable": {
-                "dataSchema": {"columnNames": ["col1"]},
-                "rows": [["data"]],
-            }
-        }
-        mock_requests.post.return_value = mock_response
+    result = pinot.execute_query(
+        "/* leading */ SELECT '; DROP TABLE test_table' AS literal FROM test_table;"
+    )
 
-        # Query joining unauthorized table should raise ValueError
-        query = """
-            SELECT a.*, b.name
-            FROM allowed_table a
-            JOIN unauthorized_table b ON a.id = b.id
-        """
-        with pytest.raises(ValueError, match="unauthorized tables"):
-            pinot.execute_query(query)
+    assert result == [{"literal": "; DROP TABLE test_table"}]
+    assert mock_requests.post.call_args.kwargs["json"]["sql"] == (
+        "SELECT '; DROP TABLE test_table' AS literal FROM test_table"
+    )
 
-    def test_execute_query_allows_authorized_tables(
-        self, mock_pinot_config, mock_requests
-    ):
-        """Test that execute_query allows queries with authorized tables."""
-        mock_pinot_config.included_tables = ["table1", "table2"]
-        pinot = PinotClient(mock_pinot_config)
 
-        # Mock the HTTP response
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            "resultTable": {
-                "dataSchema": {"columnNames": ["col1"]},
-                "rows": [["data"]],
-            }
-        }
-        mock_requests.post.return_value = mock_response
+def test_execute_query_allows_with_select(
+    pinot, mock_requests, standard_query_response
+):
+    """Test read-only validation allows WITH queries that resolve to SELECT."""
+    mock_requests.post.return_value = standard_query_response
 
-        # Query with authorized tables should succeed
-        result = pinot.execute_query(
-            "SELECT * FROM table1 JOIN table2 ON table1.id = table2.id"
-        )
+    result = pinot.execute_query(
+        "WITH cte AS (SELECT * FROM test_table) SELECT * FROM cte"
+    )
 
-        assert result == [{"col1": "data"}]
+    assert result == [{"col1": "data"}]
 
-    def test_execute_query_allows_all_when_no_filter(
-        self, mock_pinot_config, mock_requests
-    ):
-        """Test that execute_query allows any table when filtering is not configured."""
-        mock_pinot_config.included_tables = None
-        pinot = PinotClient(mock_pinot_config)
 
-        # Mock the HTTP response
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            "resultTable": {
-                "dataSchema": {"columnNames": ["col1"]},
-                "rows": [["data"]],
-            }
-        }
-        mock_requests.post.return_value = mock_response
+def test_execute_query_allows_order_by_desc(
+    pinot, mock_requests, standard_query_response
+):
+    """Test DESC sort direction is accepted in read-only SELECT queries."""
+    mock_requests.post.return_value = standard_query_response
 
-        # Should allow any table when no filter configured
-        result = pinot.execute_query("SELECT * FROM any_table_name")
+    result = pinot.execute_query(
+        "SELECT * FROM test_table ORDER BY created_at DESC LIMIT 10"
+    )
 
-        assert result == [{"col1": "data"}]
+    assert result == [{"col1": "data"}]
+    assert mock_requests.post.call_args.kwargs["json"]["sql"] == (
+        "SELECT * FROM test_table ORDER BY created_at DESC LIMIT 10"
+    )
 
-    def test_execute_query_rejects_non_select_when_no_filter(
-        self, mock_pinot_config, mock_requests
-    ):
-        """Test execute_query rejects write statements even without table filtering."""
-        mock_pinot_config.included_tables = None
-        pinot = PinotClient(mock_pinot_config)
 
-        with pytest.raises(ValueError, match="Only read-only SELECT queries"):
-            pinot.execute_query("DELETE FROM any_table_name WHERE id = 1")
+def test_execute_query_allows_trailing_pinot_option(
+    pinot, mock_requests, standard_query_response
+):
+    """Test Pinot OPTION clauses are accepted after parser validation."""
+    mock_requests.post.return_value = standard_query_response
 
-        mock_requests.post.assert_not_called()
+    result = pinot.execute_query("SELECT * FROM test_table OPTION(timeoutMs=30000)")
 
-    def test_execute_query_rejects_stacked_statement(
-        self, mock_pinot_config, mock_requests
-    ):
-        """Test execute_query rejects stacked statements after a SELECT."""
-        pinot = PinotClient(mock_pinot_config)
+    assert result == [{"col1": "data"}]
+    assert mock_requests.post.call_args.kwargs["json"]["sql"] == (
+        "SELECT * FROM test_table OPTION(timeoutMs=30000)"
+    )
 
-        with pytest.raises(
-            ValueError, match="Only a single read-only SELECT statement"
-        ):
-            pinot.execute_query("SELECT * FROM test_table; DROP TABLE test_table")
 
-        mock_requests.post.assert_not_called()
+def test_execute_query_rejects_invalid_select_syntax(pinot, mock_requests):
+    """Test parser validation rejects malformed SELECT syntax."""
+    with pytest.raises(ValueError, match="Only valid read-only SELECT"):
+        pinot.execute_query("SELECT FROM")
 
-    def test_execute_query_rejects_obfuscated_destructive_keyword(
-        self, mock_pinot_config, mock_requests
-    ):
-        """Test execute_query rejects destructive keywords hidden by comments."""
-        pinot = PinotClient(mock_pinot_config)
+    mock_requests.post.assert_not_called()
 
-        with pytest.raises(
-            ValueError, match="Only a single read-only SELECT statement"
-        ):
-            pinot.execute_query("SELECT * FROM test_table; DR/**/OP TABLE test_table")
 
-        mock_requests.post.assert_not_called()
+def test_extract_table_names_comma_separated(pinot):
+    """Test extracting table names from comma-separated tables in FROM"""
+    query = "SELECT * FROM table1, table2, table3"
 
-    def test_execute_query_rejects_prohibited_keyword_in_cte(
-        self, mock_pinot_config, mock_requests
-    ):
-        """Test execute_query rejects write operations embedded in a WITH query."""
-        pinot = PinotClient(mock_pinot_config)
+    result = pinot._extract_sql_table_names(query)
 
-        with pytest.raises(ValueError, match="prohibited keyword UPDATE"):
-            pinot.execute_query(
-                "WITH cte AS (UPDATE test_table SET name = 'x') SELECT * FROM cte"
-            )
+    assert set(result) == {"table1", "table2", "table3"}
 
-        mock_requests.post.assert_not_called()
 
-    def test_execute_query_rejects_with_without_top_level_select(
-        self, mock_pinot_config, mock_requests
-    ):
-        """Test WITH queries must resolve to a top-level SELECT."""
-        pinot = PinotClient(mock_pinot_config)
+def test_extract_table_names_with_cte(pinot):
+    """Test extracting table names from WITH clause (CTE)"""
+    query = "WITH cte AS (SELECT * FROM unauthorized_table) SELECT * FROM cte"
 
-        with pytest.raises(ValueError, match="WITH queries must resolve"):
-            pinot.execute_query("WITH cte AS (SELECT * FROM test_table) VALUES (1)")
+    result = pinot._extract_sql_table_names(query)
 
-        mock_requests.post.assert_not_called()
+    # Should find both the CTE source table and the CTE itself
+    assert "unauthorized_table" in result
 
-    def test_execute_query_allows_trailing_semicolon_comments_and_string_semicolons(
-        self, mock_pinot_config, mock_requests
-    ):
-        """Test read-only validation keeps string semicolons and strips comments."""
-        pinot = PinotClient(mock_pinot_config)
 
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            "resultTable": {
-                "dataSchema": {"columnNames": ["literal"]},
-                "rows": [["; DROP TABLE test_table"]],
-            }
-        }
-        mock_requests.post.return_value = mock_response
+def test_extract_table_names_nested_subquery(pinot):
+    """Test extracting table names from nested subquery"""
+    query = "SELECT * FROM (SELECT * FROM unauthorized_table) AS subq"
 
-        result = pinot.execute_query(
-            "/* leading */ SELECT '; DROP TABLE test_table' AS literal FROM test_table;"
-        )
+    result = pinot._extract_sql_table_names(query)
 
-        assert result == [{"literal": "; DROP TABLE test_table"}]
-        assert mock_requests.post.call_args.kwargs["json"]["sql"] == (
-            "SELECT '; DROP TABLE test_table' AS literal FROM test_table"
-        )
+    assert "unauthorized_table" in result
 
-    def test_execute_query_allows_with_select(self, mock_pinot_config, mock_requests):
-        """Test read-only validation allows WITH queries that resolve to SELECT."""
-        pinot = PinotClient(mock_pinot_config)
 
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            "resultTable": {
-                "dataSchema": {"columnNames": ["col1"]},
-                "rows": [["data"]],
-            }
-        }
-        mock_requests.post.return_value = mock_response
+@pytest.mark.parametrize(
+    "query",
+    [
+        "SELECT * FROM t1 LEFT JOIN t2 ON t1.id = t2.id",
+        "SELECT * FROM t1 RIGHT JOIN t2 ON t1.id = t2.id",
+        "SELECT * FROM t1 INNER JOIN t2 ON t1.id = t2.id",
+        "SELECT * FROM t1 OUTER JOIN t2 ON t1.id = t2.id",
+        "SELECT * FROM t1 CROSS JOIN t2",
+    ],
+    ids=["left", "right", "inner", "outer", "cross"],
+)
+def test_extract_table_names_different_join_types(pinot, query):
+    """Test extracting table names from different JOIN types"""
+    assert set(pinot._extract_sql_table_names(query)) == {"t1", "t2"}
 
-        result = pinot.execute_query(
-            "WITH cte AS (SELECT * FROM test_table) SELECT * FROM cte"
-        )
 
-        assert result == [{"col1": "data"}]
+def test_extract_table_names_union_query(pinot):
+    """Test extracting table names from UNION query"""
+    query = "SELECT * FROM table1 UNION SELECT * FROM table2"
 
-    def test_execute_query_allows_order_by_desc(self, mock_pinot_config, mock_requests):
-        """Test DESC sort direction is accepted in read-only SELECT queries."""
-        pinot = PinotClient(mock_pinot_config)
+    result = pinot._extract_sql_table_names(query)
 
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            "resultTable": {
-                "dataSchema": {"columnNames": ["col1"]},
-                "rows": [["data"]],
-            }
-        }
-        mock_requests.post.return_value = mock_response
+    assert set(result) == {"table1", "table2"}
 
-        result = pinot.execute_query(
-            "SELECT * FROM test_table ORDER BY created_at DESC LIMIT 10"
-        )
 
-        assert result == [{"col1": "data"}]
-        assert mock_requests.post.call_args.kwargs["json"]["sql"] == (
-            "SELECT * FROM test_table ORDER BY created_at DESC LIMIT 10"
-        )
+def test_extract_table_names_multiple_schemas(pinot):
+    """Test extracting table names with schema prefix"""
+    query = "SELECT * FROM database.schema.table_name"
 
-    def test_execute_query_allows_trailing_pinot_option(
-        self, mock_pinot_config, mock_requests
-    ):
-        """Test Pinot OPTION clauses are accepted after parser validation."""
-        pinot = PinotClient(mock_pinot_config)
+    result = pinot._extract_sql_table_names(query)
 
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            "resultTable": {
-                "dataSchema": {"columnNames": ["col1"]},
-                "rows": [["data"]],
-            }
-        }
-        mock_requests.post.return_value = mock_response
+    assert "table_name" in result
 
-        result = pinot.execute_query("SELECT * FROM test_table OPTION(timeoutMs=30000)")
 
-        assert result == [{"col1": "data"}]
-        assert mock_requests.post.call_args.kwargs["json"]["sql"] == (
-            "SELECT * FROM test_table OPTION(timeoutMs=30000)"
-        )
+def test_extract_table_names_removes_comments(pinot):
+    """Test that SQL comments are removed before extraction"""
+    query = """
+        -- This is a comment with FROM fake_table
+        SELECT * FROM real_table
+        /* Multi-line comment
+           FROM another_fake_table */
+    """
 
-    def test_execute_query_rejects_invalid_select_syntax(
-        self, mock_pinot_config, mock_requests
-    ):
-        """Test parser validation rejects malformed SELECT syntax."""
-        pinot = PinotClient(mock_pinot_config)
+    result = pinot._extract_sql_table_names(query)
 
-        with pytest.raises(ValueError, match="Only valid read-only SELECT"):
-            pinot.execute_query("SELECT FROM")
+    assert "real_table" in result
+    assert "fake_table" not in result
+    assert "another_fake_table" not in result
 
-        mock_requests.post.assert_not_called()
 
-    def test_execute_query_blocks_multiple_unauthorized_tables(
-        self, mock_pinot_config, mock_requests
-    ):
-        """Test that execute_query reports all unauthorized tables in error message."""
-        mock_pinot_config.included_tables = ["allowed_table"]
-        pinot = PinotClient(mock_pinot_config)
+@pytest.mark.parametrize(
+    ("query", "expected"),
+    [
+        ("SELECT 1 -- note\nFROM t", "SELECT 1 \n\nFROM t"),
+        ("SELECT 1 -- note\r\nFROM t", "SELECT 1 \n\r\nFROM t"),
+        ("SELECT /* a */ 1 /* open", "SELECT   1  "),
+        ("SELECT '-- x /* y */' AS s", "SELECT '-- x /* y */' AS s"),
+        ("SELECT 'it''s', 'a\\'b' -- c", "SELECT 'it''s', 'a\\'b' \n"),
+        ('SELECT "a""--b" FROM `t``--`', 'SELECT "a""--b" FROM `t``--`'),
+        ("SELECT `a\\` -- c", "SELECT `a\\` \n"),
+        ("SELECT 'open -- c", "SELECT 'open -- c"),
+    ],
+    ids=[
+        "line",
+        "crlf",
+        "block-and-unterminated",
+        "markers-in-string",
+        "escaped-quotes",
+        "quoted-identifiers",
+        "no-backslash-escape-in-backticks",
+        "unterminated-string",
+    ],
+)
+def test_strip_sql_comments(query, expected):
+    """Test comments are removed everywhere but inside quotes"""
+    assert _strip_sql_comments(query) == expected
+
+
+def test_extract_table_names_case_insensitive(pinot):
+    """Test that FROM and JOIN keywords are case insensitive"""
+    queries = [
+        "select * from table1",
+        "SELECT * FROM table2",
+        "SeLeCt * FrOm table3",
+        "SELECT * from table4 join table5",
+    ]
+
+    # Every query names different tables, so one pass over all of them
+    # still shows which spelling was missed
+    results = pinot._extract_sql_table_names(";\n".join(queries))
+
+    assert set(results) == {"table1", "table2", "table3", "table4", "table5"}
+
+
+def test_extract_table_names_double_quoted(pinot):
+    """Test extracting table names with double quotes"""
+    queries = [
+        'SELECT * FROM "table_name"',
+        'SELECT * FROM "table with spaces"',
+        'SELECT * FROM t1 JOIN "quoted_table" ON t1.id = quoted_table.id',
+    ]
+
+    result1 = pinot._extract_sql_table_names(queries[0])
+    assert "table_name" in result1
+
+    result2 = pinot._extract_sql_table_names(queries[1])
+    assert "table with spaces" in result2
+
+    result3 = pinot._extract_sql_table_names(queries[2])
+    assert "t1" in result3
+    assert "quoted_table" in result3
+
+
+def test_extract_table_names_backtick_quoted(pinot):
+    """Test extracting table names with backticks (MySQL style)"""
+    queries = [
+        "SELECT * FROM `table_name`",
+        "SELECT * FROM `table with spaces`",
+        "SELECT * FROM t1 JOIN `quoted_table` ON t1.id = quoted_table.id",
+    ]
+
+    result1 = pinot._extract_sql_table_names(queries[0])
+    assert "table_name" in result1
+
+    result2 = pinot._extract_sql_table_names(queries[1])
+    assert "table with spaces" in result2
+
+    result3 = pinot._extract_sql_table_names(queries[2])
+    assert "t1" in result3
+    assert "quoted_table" in result3
+
+
+def test_extract_table_names_mixed_quoted_unquoted(pinot):
+    """Test extracting mix of quoted and unquoted table names"""
+    query = 'SELECT * FROM normal_table, "quoted table", `backtick_table`'
+
+    result = pinot._extract_sql_table_names(query)
+
+    assert "normal_table" in result
+    assert "quoted table" in result
+    assert "backtick_table" in result
+
+
+def test_extract_table_names_is_cached(pinot):
+    """Test that repeated queries reuse the memoized extraction"""
+    first = pinot._extract_sql_table_names("SELECT * FROM t")
+    second = pinot._extract_sql_table_names("SELECT * FROM t")
+
+    assert first == second == ["t"]
+    assert first is not second
+    info = _sql_table_names.cache_info()
+    assert (info.hits, info.misses) == (1, 1)
+
+
+@pytest.mark.parametrize(
+    ("query", "expected"),
+    [
+        ("SELECT id, name FROM t WHERE x IN (1, y) ORDER BY id, name", {"t"}),
+        ("SELECT * FROM a JOIN b ON a.x = b.y, c", {"a", "b", "c"}),
+        (
+            "SELECT * FROM (a, b) JOIN (c JOIN d ON c.x = d.x) ON a.x = c.x",
+            {"a", "b", "c", "d"},
+        ),
+        ('SELECT * FROM "db"."t"', {"t"}),
+        ('SELECT * FROM db."t"', {"t"}),
+        ("SELECT * FROM t WHERE s = 'FROM secret, other'", {"t", "secret"}),
+        ('SELECT * FROM a AS "x)", secret', {"a", "secret"}),
+        ("SELECT (SELECT MAX(v) FROM s) AS m, k FROM t", {"s", "t"}),
+    ],
+    ids=[
+        "select-list-commas",
+        "comma-after-join",
+        "parenthesized-joins",
+        "qualified-quoted",
+        "qualified-mixed",
+        "from-in-string-fails-closed",
+        "quoted-alias-paren",
+        "scalar-subquery",
+    ],
+)
+def test_extract_table_names_from_clause_only(pinot, query, expected):
+    """Test that only names in FROM/JOIN positions are reported as tables"""
+    assert set(pinot._extract_sql_table_names(query)) == expected
+
+
+def test_validate_table_name_access_integration(mock_pinot_config, mock_requests):
+    """Test _validate_table_name_access integration with table operations"""
+    mock_pinot_config = dataclasses.replace(
+        mock_pinot_config, included_tables=["allowed_table"]
+    )
+    pinot = PinotClient(mock_pinot_config)
 
-        # Mock the HTTP response
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            "resultTable": {
-                "dataSchema": {"columnNames": ["col1"]},
-                "rows": [["data"]],
-            }
-        }
-        mock_requests.post.return_value = mock_response
+    # Blocks unauthorized table
+    with pytest.raises(ValueError, match="Access denied to table"):
+        pinot.get_table_detail("unauthorized_table")
 
-        # Query with multiple unauthorized tables
-        query = """
-            SELECT * FROM unauthorized1
-            JOIN unauthorized2 ON unauthorized1.id = unauthorized2.id
-        """
-        with pytest.raises(ValueError, match="unauthorized tables"):
-            pinot.execute_query(query)
+    # Allows authorized table
+    mock_requests.get.return_value = _json_response({"tableName": "allowed_table"})
 
-    def test_execute_query_blocks_unauthorized_table_in_subquery(
-        self, mock_pinot_config, mock_requests
-    ):
-        """Test execute_query blocks unauthorized table in subquery."""
-        mock_pinot_config.included_tables = ["allowed_table"]
-        pinot = PinotClient(mock_pinot_config)
+    result = pinot.get_table_detail("allowed_table")
+    assert result == {"tableName": "allowed_table"}
 
-        # Mock the HTTP response
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            "resultTable": {
-                "dataSchema": {"columnNames": ["col1"]},
-                "rows": [["data"]],
-            }
-        }
-        mock_requests.post.return_value = mock_response
 
-        # Query with unauthorized table in subquery should raise ValueError
-        query = """
-            SELECT * FROM allowed_table
-            WHERE id IN (SELECT id FROM unauthorized_table WHERE active = 1)
-        """
-        with pytest.raises(ValueError, match="unauthorized tables"):
-            pinot.execute_query(query)
+def test_table_operations_allow_all_when_no_filter(pinot, mock_requests):
+    """Test that table operations allow any table when filtering not configured"""
+    mock_requests.get.return_value = _json_response({"tableName": "any_table"})
 
-    def test_execute_query_allows_authorized_table_in_subquery(
-        self, mock_pinot_config, mock_requests
-    ):
-        """Test that execute_query allows queries with authorized table in subquery."""
-        mock_pinot_config.included_tables = ["allowed_table", "another_allowed"]
-        pinot = PinotClient(mock_pinot_config)
+    # Should not raise - no filtering configured
+    result = pinot.get_table_detail("any_table_name")
+    assert result == {"tableName": "any_table"}
 
-        # Mock the HTTP response
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            "resultTable": {
-                "dataSchema": {"columnNames": ["col1"]},
-                "rows": [["data"]],
-            }
-        }
-        mock_requests.post.return_value = mock_response
 
-        # Query with authorized tables in subquery should succeed
-        query = """
-            SELECT * FROM allowed_table
-            WHERE id IN (SELECT id FROM another_allowed WHERE active = 1)
-        """
-        result = pinot.execute_query(query)
+def test_create_schema_validates_schema_name_from_json(
+    mock_pinot_config, mock_requests
+):
+    """Test that create_schema validates schema name extracted from JSON"""
+    mock_pinot_config = dataclasses.replace(
+        mock_pinot_config, included_tables=["prod_*"]
+    )
+    pinot = PinotClient(mock_pinot_config)
 
-        assert result == [{"col1": "data"}]
+    # Should block unauthorized schema
+    with pytest.raises(ValueError, match="Access denied to table"):
+        pinot.create_schema('{"schemaName": "dev_unauthorized"}')
 
-    def test_extract_table_names_comma_separated(self, mock_pinot_config):
-        """Test extracting table names from comma-separated tables in FROM"""
-        pinot = PinotClient(mock_pinot_config)
-        query = "SELECT * FROM table1, table2, table3"
+    # Should allow authorized schema
+    mock_requests.post.return_value = _json_response({"status": "success"})
 
-        result = pinot._extract_sql_table_names(query)
+    result = pinot.create_schema('{"schemaName": "prod_authorized"}')
+    assert result == {"status": "success"}
 
-        assert set(result) == {"table1", "table2", "table3"}
 
-    def test_extract_table_names_with_cte(self, mock_pinot_config):
-        """Test extracting table names from WITH clause (CTE)"""
-        pinot = PinotClient(mock_pinot_config)
-        query = "WITH cte AS (SELECT * FROM unauthorized_table) SELECT * FROM cte"
+def test_create_table_config_validates_table_name_from_json(
+    mock_pinot_config, mock_requests
+):
+    """Test that create_table_config validates table name extracted from JSON"""
+    mock_pinot_config = dataclasses.replace(
+        mock_pinot_config, included_tables=["prod_*"]
+    )
+    pinot = PinotClient(mock_pinot_config)
 
-        result = pinot._extract_sql_table_names(query)
+    # Should block unauthorized table
+    with pytest.raises(ValueError, match="Access denied to table"):
+        pinot.create_table_config('{"tableName": "dev_unauthorized"}')
+
+    # Should allow authorized table
+    mock_requests.post.return_value = _json_response({"status": "success"})
+
+    result = pinot.create_table_config('{"tableName": "prod_authorized"}')
+    assert result == {"status": "success"}
 
-        # Should find both the CTE source table and the CTE itself
-        assert "unauthorized_table" in result
 
-    def test_extract_table_names_nested_subquery(self, mock_pinot_config):
-        """Test extracting table names from nested subquery"""
-        pinot = PinotClient(mock_pinot_config)
-        query = "SELECT * FROM (SELECT * FROM unauthorized_table) AS subq"
+def test_extract_table_names_excludes_join_keywords(pinot):
+    """Test that SQL JOIN keywords are not captured as table names.
 
+    The regex should not capture keywords like LEFT, RIGHT, INNER, OUTER, CROSS
+    when they appear in positions where table names are expected.
+    This test validates edge cases with malformed or unusual SQL syntax.
+    """
+    join_keywords = ["LEFT", "RIGHT", "INNER", "OUTER", "CROSS", "FULL"]
+
+    for keyword in join_keywords:
+        query = f"SELECT * FROM {keyword} JOIN table1 ON table1.id = 1"  # noqa: S608
         result = pinot._extract_sql_table_names(query)
 
-        assert "unauthorized_table" in result
+        # This test should FAIL with current implementation, proving the bug
+        assert keyword not in result, f"{keyword} should not be captured"
+        assert "table1" in result, "table1 should be captured"
 
-    def test_extract_table_names_different_join_types(self, mock_pinot_config):
-        """Test extracting table names from different JOIN types"""
-        pinot = PinotClient(mock_pinot_config)
-        queries = [
-            "SELECT * FROM t1 LEFT JOIN t2 ON t1.id = t2.id",
-            "SELECT * FROM t1 RIGHT JOIN t2 ON t1.id = t2.id",
-            "SELECT * FROM t1 INNER JOIN t2 ON t1.id = t2.id",
-            "SELECT * FROM t1 OUTER JOIN t2 ON t1.id = t2.id",
-            "SELECT * FROM t1 CROSS JOIN t2",
-        ]
 
-        for query in queries:
-            result = pinot._extract_sql_table_names(query)
-            assert set(result) == {"t1", "t2"}, f"Failed for query: {query}"
+def test_reload_table_filters_success(mock_pinot_config, tmp_path):
+    """Test successful reload of table filters."""
+    # Create a temporary filter file
+    filter_file = tmp_path / "filters.yaml"
+    filter_file.write_text("included_tables:\n  - table1\n  - table2\n")
 
-    def test_extract_table_names_union_query(self, mock_pinot_config):
-        """Test extracting table names from UNION query"""
-        pinot = PinotClient(mock_pinot_config)
-        query = "SELECT * FROM table1 UNION SELECT * FROM table2"
+    mock_pinot_config = dataclasses.replace(
+        mock_pinot_config,
+        table_filter_file=str(filter_file),
+        included_tables=["old_table"],
+    )
+    pinot = PinotClient(mock_pinot_config)
 
-        result = pinot._extract_sql_table_names(query)
+    # Reload with new filters
+    result = pinot.reload_table_filters()
 
-        assert set(result) == {"table1", "table2"}
+    assert result["status"] == "success"
+    assert result["previous_filter_count"] == 1
+    assert result["new_filter_count"] == 2
+    assert result["previous_filters"] == ["old_table"]
+    assert set(result["new_filters"]) == {"table1", "table2"}
+    assert pinot._included_tables == ["table1", "table2"]
 
-    def test_extract_table_names_multiple_schemas(self, mock_pinot_config):
-        """Test extracting table names with schema prefix"""
-        pinot = PinotClient(mock_pinot_config)
-        query = "SELECT * FROM database.schema.table_name"
 
-        result = pinot._extract_sql_table_names(query)
+def test_reload_table_filters_no_file_configured(mock_pinot_config):
+    """Test reload fails when no filter file is configured."""
+    mock_pinot_config = dataclasses.replace(mock_pinot_config, table_filter_file=None)
+    pinot = PinotClient(mock_pinot_config)
 
-        assert "table_name" in result
+    with pytest.raises(ValueError, match="No table filter file configured"):
+        pinot.reload_table_filters()
 
-    def test_extract_table_names_removes_comments(self, mock_pinot_config):
-        """Test that SQL comments are removed before extraction"""
-        pinot = PinotClient(mock_pinot_config)
-        query = """
-            -- This is a comment with FROM fake_table
-            SELECT * FROM real_table
-            /* Multi-line comment
-               FROM another_fake_table */
-        """
 
-        result = pinot._extract_sql_table_names(query)
+def test_reload_table_filters_file_not_found(mock_pinot_config):
+    """Test reload fails when filter file doesn't exist."""
+    mock_pinot_config = dataclasses.replace(
+        mock_pinot_config, table_filter_file="/nonexistent/file.yaml"
+    )
+    pinot = PinotClient(mock_pinot_config)
 
-        assert "real_table" in result
-        assert "fake_table" not in result
-        assert "another_fake_table" not in result
-
-    def test_extract_table_names_case_insensitive(self, mock_pinot_config):
-        """Test that FROM and JOIN keywords are case insensitive"""
-        pinot = PinotClient(mock_pinot_config)
-        queries = [
-            "select * from table1",
-            "SELECT * FROM table2",
-            "SeLeCt * FrOm table3",
-            "SELECT * from table4 join table5",
-        ]
-
-        results = []
-        for query in queries:
-            results.extend(pinot._extract_sql_table_names(query))
-
-        assert "table1" in results
-        assert "table2" in results
-        assert "table3" in results
-        assert "table4" in results
-        assert "table5" in results
-
-    def test_extract_table_names_double_quoted(self, mock_pinot_config):
-        """Test extracting table names with double quotes"""
-        pinot = PinotClient(mock_pinot_config)
-        queries = [
-            'SELECT * FROM "table_name"',
-            'SELECT * FROM "table with spaces"',
-            'SELECT * FROM t1 JOIN "quoted_table" ON t1.id = quoted_table.id',
-        ]
-
-        result1 = pinot._extract_sql_table_names(queries[0])
-        assert "table_name" in result1
-
-        result2 = pinot._extract_sql_table_names(queries[1])
-        assert "table with spaces" in result2
-
-        result3 = pinot._extract_sql_table_names(queries[2])
-        assert "t1" in result3
-        assert "quoted_table" in result3
-
-    def test_extract_table_names_backtick_quoted(self, mock_pinot_config):
-        """Test extracting table names with backticks (MySQL style)"""
-        pinot = PinotClient(mock_pinot_config)
-        queries = [
-            "SELECT * FROM `table_name`",
-            "SELECT * FROM `table with spaces`",
-            "SELECT * FROM t1 JOIN `quoted_table` ON t1.id = quoted_table.id",
-        ]
-
-        result1 = pinot._extract_sql_table_names(queries[0])
-        assert "table_name" in result1
-
-        result2 = pinot._extract_sql_table_names(queries[1])
-        assert "table with spaces" in result2
-
-        result3 = pinot._extract_sql_table_names(queries[2])
-        assert "t1" in result3
-        assert "quoted_table" in result3
-
-    def test_extract_table_names_mixed_quoted_unquoted(self, mock_pinot_config):
-        """Test extracting mix of quoted and unquoted table names"""
-        pinot = PinotClient(mock_pinot_config)
-        query = 'SELECT * FROM normal_table, "quoted table", `backtick_table`'
+    with pytest.raises(FileNotFoundError):
+        pinot.reload_table_filters()
 
-        result = pinot._extract_sql_table_names(query)
 
-        assert "normal_table" in result
-        assert "quoted table" in result
-        assert "backtick_table" in result
-
-    def test_validate_table_name_access_integration(
-        self, mock_pinot_config, mock_requests
-    ):
-        """Test _validate_table_name_access integration with table operations"""
-        mock_pinot_config.included_tables = ["allowed_table"]
-        pinot = PinotClient(mock_pinot_config)
-
-        # Blocks unauthorized table
-        with pytest.raises(ValueError, match="Access denied to table"):
-            pinot.get_table_detail("unauthorized_table")
-
-        # Allows authorized table
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"tableName": "allowed_table"}
-        mock_requests.get.return_value = mock_response
-
-        result = pinot.get_table_detail("allowed_table")
-        assert result == {"tableName": "allowed_table"}
-
-    def test_table_operations_allow_all_when_no_filter(
-        self, mock_pinot_config, mock_requests
-    ):
-        """Test that table operations allow any table when filtering not configured"""
-        mock_pinot_config.included_tables = None
-        pinot = PinotClient(mock_pinot_config)
-
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"tableName": "any_table"}
-        mock_requests.get.return_value = mock_response
-
-        # Should not raise - no filtering configured
-        result = pinot.get_table_detail("any_table_name")
-        assert result == {"tableName": "any_table"}
-
-    def test_create_schema_validates_schema_name_from_json(
-        self, mock_pinot_config, mock_requests
-    ):
-        """Test that create_schema validates schema name extracted from JSON"""
-        mock_pinot_config.included_tables = ["prod_*"]
-        pinot = PinotClient(mock_pinot_config)
-
-        # Should block unauthorized schema
-        with pytest.raises(ValueError, match="Access denied to table"):
-            pinot.create_schema('{"schemaName": "dev_unauthorized"}')
-
-        # Should allow authorized schema
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"status": "success"}
-        mock_requests.post.return_value = mock_response
-
-        result = pinot.create_schema('{"schemaName": "prod_authorized"}')
-        assert result == {"status": "success"}
-
-    def test_create_table_config_validates_table_name_from_json(
-        self, mock_pinot_config, mock_requests
-    ):
-        """Test that create_table_config validates table name extracted from JSON"""
-        mock_pinot_config.included_tables = ["prod_*"]
-        pinot = PinotClient(mock_pinot_config)
-
-        # Should block unauthorized table
-        with pytest.raises(ValueError, match="Access denied to table"):
-            pinot.create_table_config('{"tableName": "dev_unauthorized"}')
-
-        # Should allow authorized table
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"status": "success"}
-        mock_requests.post.return_value = mock_response
-
-        result = pinot.create_table_config('{"tableName": "prod_authorized"}')
-        assert result == {"status": "success"}
-
-    def test_extract_table_names_excludes_join_keywords(self, mock_pinot_config):
-        """Test that SQL JOIN keywords are not captured as table names.
-
-        The regex should not capture keywords like LEFT, RIGHT, INNER, OUTER, CROSS
-        when they appear in positions where table names are expected.
-        This test validates edge cases with malformed or unusual SQL syntax.
-        """
-        pinot = PinotClient(mock_pinot_config)
-        join_keywords = ["LEFT", "RIGHT", "INNER", "OUTER", "CROSS", "FULL"]
-
-        for keyword in join_keywords:
-            query = f"SELECT * FROM {keyword} JOIN table1 ON table1.id = 1"  # noqa: S608
-            result = pinot._extract_sql_table_names(query)
-
-            # This test should FAIL with current implementation, proving the bug
-            assert keyword not in result, f"{keyword} should not be captured"
-            assert "table1" in result, "table1 should be captured"
-
-    def test_reload_table_filters_success(self, mock_pinot_config, tmp_path):
-        """Test successful reload of table filters."""
-        # Create a temporary filter file
-        filter_file = tmp_path / "filters.yaml"
-        filter_file.write_text("included_tables:\n  - table1\n  - table2\n")
-
-        mock_pinot_config.table_filter_file = str(filter_file)
-        mock_pinot_config.included_tables = ["old_table"]
-        pinot = PinotClient(mock_pinot_config)
-
-        # Reload with new filters
-        result = pinot.reload_table_filters()
-
-        assert result["status"] == "success"
-        assert result["previous_filter_count"] == 1
-        assert result["new_filter_count"] == 2
-        assert result["previous_filters"] == ["old_table"]
-        assert set(result["new_filters"]) == {"table1", "table2"}
-        assert pinot._included_tables == ["table1", "table2"]
-
-    def test_reload_table_filters_no_file_configured(self, mock_pinot_config):
-        """Test reload fails when no filter file is configured."""
-        mock_pinot_config.table_filter_file = None
-        pinot = PinotClient(mock_pinot_config)
-
-        with pytest.raises(ValueError, match="No table filter file configured"):
-            pinot.reload_table_filters()
-
-    def test_reload_table_filters_file_not_found(self, mock_pinot_config):
-        """Test reload fails when filter file doesn't exist."""
-        mock_pinot_config.table_filter_file = "/nonexistent/file.yaml"
-        pinot = PinotClient(mock_pinot_config)
-
-        with pytest.raises(FileNotFoundError):
-            pinot.reload_table_filters()
-
-    def test_reload_table_filters_empty_list(self, mock_pinot_config, tmp_path):
-        """Test reload with empty filter list returns None."""
-        # Create filter file with empty list
-        filter_file = tmp_path / "filters.yaml"
-        filter_file.write_text("included_tables: []\n")
-
-        mock_pinot_config.table_filter_file = str(filter_file)
-        mock_pinot_config.included_tables = ["table1", "table2"]
-        pinot = PinotClient(mock_pinot_config)
-
-        result = pinot.reload_table_filters()
-
-        assert result["status"] == "success"
-        assert result["previous_filter_count"] == 2
-        assert result["new_filter_count"] == 0
-        assert result["new_filters"] is None
-        assert pinot._included_tables is None
-
-    def test_reload_table_filters_from_none_to_filters(
-        self, mock_pinot_config, tmp_path
-    ):
-        """Test reload from no filters to having filters."""
-        filter_file = tmp_path / "filters.yaml"
-        filter_file.write_text("included_tables:\n  - prod_*\n")
-
-        mock_pinot_config.table_filter_file = str(filter_file)
-        mock_pinot_config.included_tables = None
-        pinot = PinotClient(mock_pinot_config)
-
-        result = pinot.reload_table_filters()
-
-        assert result["status"] == "success"
-        assert result["previous_filter_count"] == 0
-        assert result["new_filter_count"] == 1
-        assert result["previous_filters"] is None
-        assert result["new_filters"] == ["prod_*"]
+def test_reload_table_filters_empty_list(mock_pinot_config, tmp_path):
+    """Test reload with empty filter list returns None."""
+    # Create filter file with empty list
+    filter_file = tmp_path / "filters.yaml"
+    filter_file.write_text("included_tables: []\n")
+
+    mock_pinot_config = dataclasses.replace(
+        mock_pinot_config,
+        table_filter_file=str(filter_file),
+        included_tables=["table1", "table2"],
+    )
+    pinot = PinotClient(mock_pinot_config)
+
+    result = pinot.reload_table_filters()
+
+    assert result["status"] == "success"
+    assert result["previous_filter_count"] == 2
+    assert result["new_filter_count"] == 0
+    assert result["new_filters"] is None
+    assert pinot._included_tables is None
+
+
+def test_reload_table_filters_from_none_to_filters(mock_pinot_config, tmp_path):
+    """Test reload from no filters to having filters."""
+    filter_file = tmp_path / "filters.yaml"
+    filter_file.write_text("included_tables:\n  - prod_*\n")
+
+    mock_pinot_config = dataclasses.replace(
+        mock_pinot_config, table_filter_file=str(filter_file), included_tables=None
+    )
+    pinot = PinotClient(mock_pinot_config)
+
+    result = pinot.reload_table_filters()
+
+    assert result["status"] == "success"
+    assert result["previous_filter_count"] == 0
+    assert result["new_filter_count"] == 1
+    assert result["previous_filters"] is None
+    assert result["new_filters"] == ["prod_*"]
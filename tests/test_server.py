@@ -4,9 +4,15 @@ from unittest.mock import patch
 from fastmcp import Client
 from fastmcp.exceptions import ToolError
 import pytest
+import pytest_asyncio
 
+from mcp_pinot.config import ServerConfig
+from mcp_pinot.models import SegmentList
 from mcp_pinot.server import _is_loopback_host, main, mcp
 
+_SCHEMA_JSON = '{"schemaName": "test", "dimensionFieldSpecs": []}'
+_TABLE_CONFIG_JSON = '{"tableName": "test", "tableType": "OFFLINE"}'
+
 
 @pytest.fixture
 def mock_pinot_client():
@@ -47,6 +53,15 @@ def mock_pinot_client():
         yield mock_client
 
 
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def listed_tools():
+    """Tool definitions as a client sees them, listed once per module."""
+    async with Client(mcp) as client:
+        return {t.name: t for t in await client.list_tools()}
+
+
+# The async tests all drive the same in-process server, so they run on one
+# module-scoped event loop rather than creating and closing a loop each test
 class TestFastMCPServer:
     """Test the FastMCP-based server implementation"""
 
@@ -55,11 +70,10 @@ class TestFastMCPServer:
         assert mcp is not None
         assert mcp.name == "Pinot MCP Server"
 
-    @pytest.mark.asyncio
-    async def test_tools_registration(self):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_tools_registration(self, listed_tools):
         """Test that all tools are properly registered"""
-        tools = await mcp.list_tools()
-        tool_names = [t.name for t in tools]
+        tool_names = list(listed_tools)
 
         expected_tools = [
             "test_connection",
@@ -84,14 +98,11 @@ class TestFastMCPServer:
                 f"Tool {tool_name} not found in registered tools"
             )
 
-    @pytest.mark.asyncio
-    async def test_every_tool_has_output_schema_and_annotations(self):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_every_tool_has_output_schema_and_annotations(self, listed_tools):
         """Definition-quality contract: every tool documents output + annotations."""
-        async with Client(mcp) as client:
-            tools = await client.list_tools()
-
-        assert tools, "no tools registered"
-        for tool in tools:
+        assert listed_tools, "no tools registered"
+        for tool in listed_tools.values():
             assert tool.inputSchema, f"{tool.name} missing inputSchema"
             assert tool.outputSchema, f"{tool.name} missing outputSchema"
             assert tool.annotations is not None, f"{tool.name} missing annotations"
@@ -100,24 +111,20 @@ class TestFastMCPServer:
                 f"{tool.name} missing readOnlyHint"
             )
 
-    @pytest.mark.asyncio
-    async def test_read_query_param_constraints_in_schema(self):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_read_query_param_constraints_in_schema(self, listed_tools):
         """read_query advertises the pagination bounds in its input schema."""
-        async with Client(mcp) as client:
-            tools = {t.name: t for t in await client.list_tools()}
-        props = tools["read_query"].inputSchema["properties"]
+        props = listed_tools["read_query"].inputSchema["properties"]
         assert props["limit"]["maximum"] == 10000
         assert props["limit"]["minimum"] == 1
         assert props["offset"]["minimum"] == 0
 
-    @pytest.mark.asyncio
-    async def test_inspection_tools_document_output_fields(self):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_inspection_tools_document_output_fields(self, listed_tools):
         """Pass-through inspection tools publish documented output schemas."""
-        async with Client(mcp) as client:
-            tools = {t.name: t for t in await client.list_tools()}
 
         def schema_text(name: str) -> str:
-            return json.dumps(tools[name].outputSchema)
+            return json.dumps(listed_tools[name].outputSchema)
 
         assert "schemaName" in schema_text("get_schema")
         assert "dimensionFieldSpecs" in schema_text("get_schema")
@@ -125,19 +132,19 @@ class TestFastMCPServer:
         assert "tableType" in schema_text("get_table_config")
         assert "OFFLINE" in schema_text("segment_list")
 
-    @pytest.mark.asyncio
-    async def test_write_tools_accept_object_or_string_payload(self):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_write_tools_accept_object_or_string_payload(self, listed_tools):
         """schemaJson / tableConfigJson advertise object-or-string input."""
-        async with Client(mcp) as client:
-            tools = {t.name: t for t in await client.list_tools()}
-        schema_prop = tools["create_schema"].inputSchema["properties"]["schemaJson"]
-        config_prop = tools["create_table_config"].inputSchema["properties"][
+        schema_prop = listed_tools["create_schema"].inputSchema["properties"][
+            "schemaJson"
+        ]
+        config_prop = listed_tools["create_table_config"].inputSchema["properties"][
             "tableConfigJson"
         ]
         assert "anyOf" in schema_prop
         assert "anyOf" in config_prop
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_create_schema_accepts_structured_object(self, mock_pinot_client):
         """A structured object payload is serialized to JSON for the client."""
         async with Client(mcp) as client:
@@ -152,23 +159,19 @@ class TestFastMCPServer:
 
     def test_segment_list_normalizes_list_form(self):
         """SegmentList merges Pinot's list-of-maps form into one object."""
-        from mcp_pinot.models import SegmentList
-
         merged = SegmentList.model_validate([{"OFFLINE": ["s1"]}, {"REALTIME": ["s2"]}])
         assert merged.OFFLINE == ["s1"]
         assert merged.REALTIME == ["s2"]
 
-    @pytest.mark.asyncio
-    async def test_get_table_config_table_type_is_enum(self):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_get_table_config_table_type_is_enum(self, listed_tools):
         """tableType is constrained to the valid Pinot table types."""
-        async with Client(mcp) as client:
-            tools = {t.name: t for t in await client.list_tools()}
-        schema = tools["get_table_config"].inputSchema
+        schema = listed_tools["get_table_config"].inputSchema
         # Literal[...] | None renders as an enum (often via anyOf); assert the
         # allowed values appear somewhere in the property schema.
         assert "OFFLINE" in str(schema) and "REALTIME" in str(schema)
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_prompts_registration(self):
         """Test that prompts are properly registered"""
         prompts = await mcp.list_prompts()
@@ -177,7 +180,7 @@ class TestFastMCPServer:
             "Prompt pinot_query not found in registered prompts"
         )
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_explore_table_prompt_renders(self):
         """The explore_table prompt renders with the provided table name."""
         async with Client(mcp) as client:
@@ -187,7 +190,7 @@ class TestFastMCPServer:
         )
         assert "orders" in text
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_resources_registered(self, mock_pinot_client):
         """Catalog resources are registered (static + templated)."""
         async with Client(mcp) as client:
@@ -199,7 +202,7 @@ class TestFastMCPServer:
         assert any("pinot://schema/" in u for u in template_uris)
         assert any("pinot://table-config/" in u for u in template_uris)
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_read_tables_and_schema_resources(self, mock_pinot_client):
         """The static and templated resources read through to the client."""
         async with Client(mcp) as client:
@@ -213,7 +216,7 @@ class TestFastMCPServer:
         assert "schema" in schema_text
         assert "config" in config_text
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_tool_test_connection(self, mock_pinot_client):
         """test_connection returns typed diagnostics."""
         async with Client(mcp) as client:
@@ -223,7 +226,7 @@ class TestFastMCPServer:
         assert result.structured_content["connection_test"] is True
         assert result.structured_content["tables_count"] == 1
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_tool_test_connection_does_not_leak_internals(
         self, mock_pinot_client
     ):
@@ -255,7 +258,7 @@ class TestFastMCPServer:
         assert "broker_host" not in sc
         assert "controller_url" not in sc
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_tool_read_query(self, mock_pinot_client):
         """read_query returns a typed, paginated QueryResult."""
         async with Client(mcp) as client:
@@ -274,7 +277,7 @@ class TestFastMCPServer:
             query="SELECT * FROM test_table"
         )
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_tool_read_query_paginates(self, mock_pinot_client):
         """read_query honors limit/offset and reports has_more."""
         mock_pinot_client.execute_query.return_value = [
@@ -293,7 +296,7 @@ class TestFastMCPServer:
         assert sc["total_rows"] == 3
         assert sc["has_more"] is True
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_tool_read_query_rejects_out_of_range_limit(self, mock_pinot_client):
         """Schema constraints reject an invalid limit before the tool runs."""
         async with Client(mcp) as client:
@@ -305,7 +308,7 @@ class TestFastMCPServer:
         assert result.is_error is True
         mock_pinot_client.execute_query.assert_not_called()
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_tool_read_query_invalid_passes_message_through(
         self, mock_pinot_client
     ):
@@ -322,7 +325,7 @@ class TestFastMCPServer:
                     "read_query", {"query": "INSERT INTO test_table VALUES (1)"}
                 )
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_tool_read_query_error_is_masked(self, mock_pinot_client):
         """Non-validation errors are masked behind an actionable message."""
         mock_pinot_client.execute_query.side_effect = Exception("secret-host:7000")
@@ -337,7 +340,7 @@ class TestFastMCPServer:
         assert "read_query failed" in message
         assert "secret-host" not in message
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_tool_list_tables(self, mock_pinot_client):
         """list_tables returns a typed, paginated TableList."""
         async with Client(mcp) as client:
@@ -349,7 +352,7 @@ class TestFastMCPServer:
         assert sc["total_tables"] == 1
         assert sc["has_more"] is False
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_tool_reload_table_filters(self, mock_pinot_client):
         """reload_table_filters returns a typed FilterReloadResult."""
         async with Client(mcp) as client:
@@ -358,21 +361,60 @@ class TestFastMCPServer:
         assert result.structured_content["status"] == "success"
         assert result.structured_content["new_filter_count"] == 2
 
-    @pytest.mark.asyncio
-    async def test_tool_table_details(self, mock_pinot_client):
-        async with Client(mcp) as client:
-            result = await client.call_tool(
-                "table_details", {"tableName": "test_table"}
-            )
-        assert result.structured_content["tableName"] == "test_table"
-
-    @pytest.mark.asyncio
-    async def test_tool_segment_list(self, mock_pinot_client):
+    @pytest.mark.asyncio(loop_scope="module")
+    @pytest.mark.parametrize(
+        ("tool", "arguments", "key", "expected"),
+        [
+            ("table_details", {"tableName": "test_table"}, "tableName", "test_table"),
+            ("segment_list", {"tableName": "test_table"}, "OFFLINE", ["segment1"]),
+            (
+                "index_column_details",
+                {"tableName": "test_table", "segmentName": "segment1"},
+                "indexes",
+                ["index1"],
+            ),
+            (
+                "segment_metadata_details",
+                {"tableName": "test_table"},
+                "metadata",
+                "test",
+            ),
+            (
+                "tableconfig_schema_details",
+                {"tableName": "test_table"},
+                "config",
+                "test",
+            ),
+            ("create_schema", {"schemaJson": _SCHEMA_JSON}, "status", "created"),
+            (
+                "update_schema",
+                {"schemaName": "test", "schemaJson": _SCHEMA_JSON},
+                "status",
+                "updated",
+            ),
+            ("get_schema", {"schemaName": "test"}, "schema", "test"),
+            (
+                "create_table_config",
+                {"tableConfigJson": _TABLE_CONFIG_JSON},
+                "status",
+                "created",
+            ),
+            (
+                "update_table_config",
+                {"tableName": "test", "tableConfigJson": _TABLE_CONFIG_JSON},
+                "status",
+                "updated",
+            ),
+            ("get_table_config", {"tableName": "test"}, "config", "test"),
+        ],
+    )
+    async def test_tool_call(self, mock_pinot_client, tool, arguments, key, expected):
+        """Each passthrough tool returns the client's result as structured content."""
         async with Client(mcp) as client:
-            result = await client.call_tool("segment_list", {"tableName": "test_table"})
-        assert "OFFLINE" in result.structured_content
+            result = await client.call_tool(tool, arguments)
+        assert result.structured_content[key] == expected
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_segment_list_paginates(self, mock_pinot_client):
         """segment_list caps output and reports pagination metadata."""
         mock_pinot_client.get_segments.return_value = {
@@ -390,47 +432,13 @@ class TestFastMCPServer:
         assert sc["OFFLINE"] == ["seg0", "seg1", "seg2"]
         assert sc["REALTIME"] == []
 
-    @pytest.mark.asyncio
-    async def test_tool_index_column_details(self, mock_pinot_client):
-        async with Client(mcp) as client:
-            result = await client.call_tool(
-                "index_column_details",
-                {"tableName": "test_table", "segmentName": "segment1"},
-            )
-        assert "indexes" in result.structured_content
-
-    @pytest.mark.asyncio
-    async def test_tool_segment_metadata_details(self, mock_pinot_client):
-        async with Client(mcp) as client:
-            result = await client.call_tool(
-                "segment_metadata_details", {"tableName": "test_table"}
-            )
-        assert "metadata" in result.structured_content
-
-    @pytest.mark.asyncio
-    async def test_tool_tableconfig_schema_details(self, mock_pinot_client):
-        async with Client(mcp) as client:
-            result = await client.call_tool(
-                "tableconfig_schema_details", {"tableName": "test_table"}
-            )
-        assert "config" in result.structured_content
-
-    @pytest.mark.asyncio
-    async def test_tool_create_schema(self, mock_pinot_client):
-        schema_json = '{"schemaName": "test", "dimensionFieldSpecs": []}'
-        async with Client(mcp) as client:
-            result = await client.call_tool(
-                "create_schema", {"schemaJson": schema_json}
-            )
-        assert result.structured_content["status"] == "created"
-
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_tool_create_schema_handles_string_success_body(
         self, mock_pinot_client
     ):
         """Pinot can return a bare JSON string on success; the tool must not crash."""
         mock_pinot_client.create_schema.return_value = "myschema successfully added"
-        schema_json = '{"schemaName": "test", "dimensionFieldSpecs": []}'
+        schema_json = _SCHEMA_JSON
         async with Client(mcp) as client:
             result = await client.call_tool(
                 "create_schema", {"schemaJson": schema_json}
@@ -440,7 +448,7 @@ class TestFastMCPServer:
         assert sc["status"] == "success"
         assert "myschema successfully added" in sc["message"]
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_tool_create_schema_dry_run_does_not_apply(self, mock_pinot_client):
         """dry_run previews without mutating and validates the payload."""
         schema_json = '{"schemaName": "previewed", "dimensionFieldSpecs": []}'
@@ -452,7 +460,7 @@ class TestFastMCPServer:
         assert "previewed" in result.structured_content["message"]
         mock_pinot_client.create_schema.assert_not_called()
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_tool_create_schema_dry_run_rejects_bad_json(self, mock_pinot_client):
         """dry_run rejects an invalid JSON payload with an actionable error."""
         async with Client(mcp) as client:
@@ -462,47 +470,7 @@ class TestFastMCPServer:
                 )
         mock_pinot_client.create_schema.assert_not_called()
 
-    @pytest.mark.asyncio
-    async def test_tool_update_schema(self, mock_pinot_client):
-        schema_json = '{"schemaName": "test", "dimensionFieldSpecs": []}'
-        async with Client(mcp) as client:
-            result = await client.call_tool(
-                "update_schema", {"schemaName": "test", "schemaJson": schema_json}
-            )
-        assert result.structured_content["status"] == "updated"
-
-    @pytest.mark.asyncio
-    async def test_tool_get_schema(self, mock_pinot_client):
-        async with Client(mcp) as client:
-            result = await client.call_tool("get_schema", {"schemaName": "test"})
-        assert "schema" in result.structured_content
-
-    @pytest.mark.asyncio
-    async def test_tool_create_table_config(self, mock_pinot_client):
-        config_json = '{"tableName": "test", "tableType": "OFFLINE"}'
-        async with Client(mcp) as client:
-            result = await client.call_tool(
-                "create_table_config", {"tableConfigJson": config_json}
-            )
-        assert result.structured_content["status"] == "created"
-
-    @pytest.mark.asyncio
-    async def test_tool_update_table_config(self, mock_pinot_client):
-        config_json = '{"tableName": "test", "tableType": "OFFLINE"}'
-        async with Client(mcp) as client:
-            result = await client.call_tool(
-                "update_table_config",
-                {"tableName": "test", "tableConfigJson": config_json},
-            )
-        assert result.structured_content["status"] == "updated"
-
-    @pytest.mark.asyncio
-    async def test_tool_get_table_config(self, mock_pinot_client):
-        async with Client(mcp) as client:
-            result = await client.call_tool("get_table_config", {"tableName": "test"})
-        assert "config" in result.structured_content
-
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_prompt_pinot_query(self):
         async with Client(mcp) as client:
             result = await client.get_prompt("pinot_query", {})
@@ -532,134 +500,130 @@ class TestMainFunction:
 
     def test_main_function_http_transport(self, mock_pinot_client):
         """main() forwards transport/host/port/path for HTTP."""
-        with patch("mcp_pinot.server.server_config") as mock_server_config:
-            mock_server_config.transport = "http"
-            mock_server_config.host = "127.0.0.1"
-            mock_server_config.port = 8000
-            mock_server_config.path = "/mcp"
-            mock_server_config.ssl_keyfile = None
-            mock_server_config.ssl_certfile = None
-            mock_server_config.oauth_enabled = False
-
-            with patch("mcp_pinot.server.mcp.run") as mock_mcp_run:
-                main()
-
-                mock_mcp_run.assert_called_once()
-                kwargs = mock_mcp_run.call_args.kwargs
-                assert kwargs["transport"] == "http"
-                assert kwargs["host"] == "127.0.0.1"
-                assert kwargs["port"] == 8000
-                assert kwargs["path"] == "/mcp"
+        config = ServerConfig(
+            transport="http",
+            host="127.0.0.1",
+            port=8000,
+            path="/mcp",
+            ssl_keyfile=None,
+            ssl_certfile=None,
+            oauth_enabled=False,
+        )
+        with (
+            patch("mcp_pinot.server.server_config", config),
+            patch("mcp_pinot.server.mcp.run") as mock_mcp_run,
+        ):
+            main()
+
+            mock_mcp_run.assert_called_once()
+            kwargs = mock_mcp_run.call_args.kwargs
+            assert kwargs["transport"] == "http"
+            assert kwargs["host"] == "127.0.0.1"
+            assert kwargs["port"] == 8000
+            assert kwargs["path"] == "/mcp"
 
     def test_main_function_http_transport_with_ssl(self, mock_pinot_client):
         """Test the main function with HTTP transport and SSL"""
-        with patch("mcp_pinot.server.server_config") as mock_server_config:
-            mock_server_config.transport = "http"
-            mock_server_config.host = "0.0.0.0"
-            mock_server_config.port = 8000
-            mock_server_config.ssl_keyfile = "/path/to/key.pem"
-            mock_server_config.ssl_certfile = "/path/to/cert.pem"
-            mock_server_config.path = "/mcp"
-            mock_server_config.oauth_enabled = True
-
-            with (
-                patch("mcp_pinot.server._auth", object()),
-                patch("mcp_pinot.server.uvicorn.run") as mock_uvicorn_run,
-            ):
-                main()
-
-                mock_uvicorn_run.assert_called_once()
-                call_args = mock_uvicorn_run.call_args
-                assert call_args[1]["ssl_keyfile"] == "/path/to/key.pem"
-                assert call_args[1]["ssl_certfile"] == "/path/to/cert.pem"
+        config = ServerConfig(
+            transport="http",
+            host="0.0.0.0",
+            port=8000,
+            ssl_keyfile="/path/to/key.pem",
+            ssl_certfile="/path/to/cert.pem",
+            path="/mcp",
+            oauth_enabled=True,
+        )
+        with (
+            patch("mcp_pinot.server.server_config", config),
+            patch("mcp_pinot.server._auth", object()),
+            patch("mcp_pinot.server.uvicorn.run") as mock_uvicorn_run,
+        ):
+            main()
+
+            mock_uvicorn_run.assert_called_once()
+            call_args = mock_uvicorn_run.call_args
+            assert call_args[1]["ssl_keyfile"] == "/path/to/key.pem"
+            assert call_args[1]["ssl_certfile"] == "/path/to/cert.pem"
 
     def test_main_function_streamable_http_transport(self, mock_pinot_client):
         """Test the main function with streamable-http transport"""
-        with patch("mcp_pinot.server.server_config") as mock_server_config:
-            mock_server_config.transport = "streamable-http"
-            mock_server_config.host = "0.0.0.0"
-            mock_server_config.port = 8000
-            mock_server_config.ssl_keyfile = None
-            mock_server_config.ssl_certfile = None
-            mock_server_config.oauth_enabled = True
-
-            with (
-                patch("mcp_pinot.server._auth", object()),
-                patch("mcp_pinot.server.mcp.run") as mock_mcp_run,
-            ):
-                main()
+        config = ServerConfig(
+            transport="streamable-http",
+            host="0.0.0.0",
+            port=8000,
+            ssl_keyfile=None,
+            ssl_certfile=None,
+            oauth_enabled=True,
+        )
+        with (
+            patch("mcp_pinot.server.server_config", config),
+            patch("mcp_pinot.server._auth", object()),
+            patch("mcp_pinot.server.mcp.run") as mock_mcp_run,
+        ):
+            main()
 
-                mock_mcp_run.assert_called_once()
-                call_args = mock_mcp_run.call_args
-                assert call_args[1]["transport"] == "streamable-http"
+            mock_mcp_run.assert_called_once()
+            call_args = mock_mcp_run.call_args
+            assert call_args[1]["transport"] == "streamable-http"
 
     def test_main_function_stdio_transport(self, mock_pinot_client):
         """Test the main function with STDIO transport"""
-        with patch("mcp_pinot.server.server_config") as mock_server_config:
-            mock_server_config.transport = "stdio"
-            mock_server_config.host = "0.0.0.0"
-            mock_server_config.port = 8000
-            mock_server_config.path = "/mcp"
-            mock_server_config.ssl_keyfile = None
-            mock_server_config.ssl_certfile = None
-            mock_server_config.oauth_enabled = False
-
-            with patch("mcp_pinot.server.mcp.run") as mock_mcp_run:
-                main()
+        config = ServerConfig(
+            transport="stdio",
+            host="0.0.0.0",
+            port=8000,
+            path="/mcp",
+            ssl_keyfile=None,
+            ssl_certfile=None,
+            oauth_enabled=False,
+        )
+        with (
+            patch("mcp_pinot.server.server_config", config),
+            patch("mcp_pinot.server.mcp.run") as mock_mcp_run,
+        ):
+            main()
 
-                mock_mcp_run.assert_called_once()
-                call_args = mock_mcp_run.call_args
-                assert call_args[1]["transport"] == "stdio"
-
-    def test_main_function_refuses_network_http_without_oauth(self, mock_pinot_client):
-        """Test HTTP transport fails closed on non-loopback hosts without OAuth."""
-        with patch("mcp_pinot.server.server_config") as mock_server_config:
-            mock_server_config.transport = "http"
-            mock_server_config.host = "0.0.0.0"
-            mock_server_config.port = 8000
-            mock_server_config.path = "/mcp"
-            mock_server_config.ssl_keyfile = None
-            mock_server_config.ssl_certfile = None
-            mock_server_config.oauth_enabled = False
-
-            with patch("mcp_pinot.server.mcp.run") as mock_mcp_run:
-                with pytest.raises(SystemExit, match="Refusing to start"):
-                    main()
-
-                mock_mcp_run.assert_not_called()
-
-    def test_main_function_refuses_network_https_without_oauth(self, mock_pinot_client):
-        """Test TLS alone is not accepted as HTTP authentication."""
-        with patch("mcp_pinot.server.server_config") as mock_server_config:
-            mock_server_config.transport = "http"
-            mock_server_config.host = "0.0.0.0"
-            mock_server_config.port = 8000
-            mock_server_config.path = "/mcp"
-            mock_server_config.ssl_keyfile = "/path/to/key.pem"
-            mock_server_config.ssl_certfile = "/path/to/cert.pem"
-            mock_server_config.oauth_enabled = False
-
-            with patch("mcp_pinot.server.uvicorn.run") as mock_uvicorn_run:
-                with pytest.raises(SystemExit, match="without authentication"):
-                    main()
-
-                mock_uvicorn_run.assert_not_called()
-
-    def test_main_function_refuses_stdio_tls_http_without_oauth(
-        self, mock_pinot_client
+            mock_mcp_run.assert_called_once()
+            call_args = mock_mcp_run.call_args
+            assert call_args[1]["transport"] == "stdio"
+
+    @pytest.mark.parametrize(
+        ("transport", "keyfile", "certfile", "match"),
+        [
+            # Plain HTTP on a non-loopback host
+            ("http", None, None, "Refusing to start"),
+            # TLS alone is not accepted as HTTP authentication
+            ("http", "/path/to/key.pem", "/path/to/cert.pem", "without authentication"),
+            # TLS-enabled stdio config still starts HTTP
+            (
+                "stdio",
+                "/path/to/key.pem",
+                "/path/to/cert.pem",
+                "without authentication",
+            ),
+        ],
+        ids=["http", "https", "stdio-tls"],
+    )
+    def test_main_function_refuses_network_http_without_oauth(
+        self, mock_pinot_client, transport, keyfile, certfile, match
     ):
-        """Test TLS-enabled stdio config still fails closed because HTTP starts."""
-        with patch("mcp_pinot.server.server_config") as mock_server_config:
-            mock_server_config.transport = "stdio"
-            mock_server_config.host = "0.0.0.0"
-            mock_server_config.port = 8000
-            mock_server_config.path = "/mcp"
-            mock_server_config.ssl_keyfile = "/path/to/key.pem"
-            mock_server_config.ssl_certfile = "/path/to/cert.pem"
-            mock_server_config.oauth_enabled = False
-
-            with patch("mcp_pinot.server.uvicorn.run") as mock_uvicorn_run:
-                with pytest.raises(SystemExit, match="without authentication"):
-                    main()
-
-                mock_uvicorn_run.assert_not_called()
+        """Test HTTP fails closed on non-loopback hosts without OAuth."""
+        config = ServerConfig(
+            transport=transport,
+            host="0.0.0.0",
+            port=8000,
+            path="/mcp",
+            ssl_keyfile=keyfile,
+            ssl_certfile=certfile,
+            oauth_enabled=False,
+        )
+        with (
+            patch("mcp_pinot.server.server_config", config),
+            patch("mcp_pinot.server.mcp.run") as mock_mcp_run,
+            patch("mcp_pinot.server.uvicorn.run") as mock_uvicorn_run,
+        ):
+            with pytest.raises(SystemExit, match=match):
+                main()
+
+            mock_mcp_run.assert_not_called()
+            mock_uvicorn_run.assert_not_called()